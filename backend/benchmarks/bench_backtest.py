@@ -0,0 +1,105 @@
+"""
+Walk-forward backtest: the frontend algorithm (processData on matches.slice(0, i) for every
+match, quadratic) vs the incremental backend engine (one linear pass), on the 16 model settings
+searched by findBestStrategy.
+
+Usage: python -m backend.benchmarks.bench_backtest [--teams 18] [--seasons 1]
+"""
+import time
+import random
+import argparse
+import statistics
+
+from backend.services.backtest_engine import evaluate_strategy, sort_matches, parse_n_games, VOLATILE_STATS
+
+N_GAMES_OPTIONS = [3, 5, 10, "all"]
+
+def make_season(n_teams, seasons, seed=7):
+    """Double round-robin seasons with random corners."""
+    rng = random.Random(seed)
+    teams = [f"Team {i}" for i in range(n_teams)]
+    rows, giornata = [], 0
+    for _ in range(seasons):
+        for leg in range(2):
+            for r in range(n_teams - 1):
+                giornata += 1
+                rotated = teams[:1] + teams[1:][r:] + teams[1:][:r]
+                for k in range(n_teams // 2):
+                    home, away = rotated[k], rotated[-k - 1]
+                    if leg:
+                        home, away = away, home
+                    rows.append({
+                        "id": len(rows) + 1, "giornata": giornata, "home_team": home, "away_team": away,
+                        "home_corners": rng.randint(0, 10), "away_corners": rng.randint(0, 8)
+                    })
+    return rows
+
+def evaluate_quadratic(rows, statistic, model_params, betting_params):
+    """Python port of evaluateStrategy + processData + calculatePrediction (standard mode)."""
+    matches = sort_matches(rows)
+    limit = parse_n_games(model_params["nGames"])
+    use_median = statistic in VOLATILE_STATS and not model_params["forceMean"]
+    agg = (lambda l: statistics.median(l) if l else 0) if use_median else (lambda l: sum(l) / len(l) if l else 0)
+    wins = total_bets = 0
+
+    for i, target in enumerate(matches):
+        # processData(matches.slice(0, i))
+        team_matches = {}
+        for m in sorted(matches[:i], key=lambda m: -m["giornata"]):
+            h, a = m["home_team"], m["away_team"]
+            vh, va = m[f"home_{statistic}"], m[f"away_{statistic}"]
+            team_matches.setdefault(h, []).append(("Home", vh, va, m["giornata"]))
+            team_matches.setdefault(a, []).append(("Away", va, vh, m["giornata"]))
+
+        home, away = target["home_team"], target["away_team"]
+        if home not in team_matches or away not in team_matches:
+            continue
+
+        def relevant(team, location):
+            ms = team_matches[team] if model_params["useGeneralStats"] else [m for m in team_matches[team] if m[0] == location]
+            ms = sorted(ms, key=lambda m: -m[3])
+            return ms[:limit] if limit else ms
+
+        hm, am = relevant(home, "Home"), relevant(away, "Away")
+        h_for, h_ag = agg([m[1] for m in hm]), agg([m[2] for m in hm])
+        a_for, a_ag = agg([m[1] for m in am]), agg([m[2] for m in am])
+        total = (h_for + a_ag) / 2 + (a_for + h_ag) / 2
+        if total <= 0:
+            continue
+
+        line = int(total - betting_params["softBuffer"] + 0.5) - 0.5
+        wins += (target[f"home_{statistic}"] + target[f"away_{statistic}"]) > line
+        total_bets += 1
+
+    return {"winRate": wins / total_bets if total_bets else 0, "totalBets": total_bets, "wins": wins}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the walk-forward backtest.")
+    parser.add_argument("--teams", type=int, default=18)
+    parser.add_argument("--seasons", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = make_season(args.teams, args.seasons)
+    betting = {"softBuffer": 0.5, "minPrediction": 0, "maxLineCap": None}
+    combos = [
+        {"nGames": n, "forceMean": fm, "useGeneralStats": g}
+        for n in N_GAMES_OPTIONS for fm in (False, True) for g in (False, True)
+    ]
+
+    start = time.perf_counter()
+    slow = [evaluate_quadratic(rows, "corners", c, betting) for c in combos]
+    slow_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [evaluate_strategy(rows, "corners", c, betting) for c in combos]
+    fast_time = time.perf_counter() - start
+
+    for c, s, f in zip(combos, slow, fast):
+        assert (s["wins"], s["totalBets"]) == (f["wins"], f["totalBets"]), f"Mismatch for {c}: {s} vs {f}"
+
+    print(f"Matches: {len(rows)}, strategies: {len(combos)} (findBestStrategy grid)")
+    print(f"Quadratic (processData per match): {slow_time:.2f}s")
+    print(f"Incremental engine:                {fast_time:.3f}s  ({slow_time / fast_time:.0f}x faster, identical results)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Prompt size of the commentary section: every line (previous prompt) vs the local digest
+(score, card timeline, corner/foul windows and clusters + salient lines within the budget),
+on a synthetic full-match commentary in the site's format (newest line first).
+
+Usage: python -m backend.benchmarks.bench_commentary_digest [--lines 300] [--budget 1200]
+"""
+import time
+import random
+import argparse
+
+from backend.services.commentary_digest import format_digest, digest_commentary
+
+HOME, AWAY = "Ajax", "PSV"
+FILLER = [
+    "{team} prova a costruire dal basso, ma la manovra è lenta e prevedibile.",
+    "Lungo possesso palla di {team} nella propria metà campo.",
+    "Il pallone viene recuperato da {player} ({team}) a centrocampo, che avvia subito l'azione.",
+    "{player} ({team}) tenta un cross dalla destra, ma la difesa libera senza problemi.",
+    "Tiro da fuori area di {player} ({team}), il pallone finisce alto sopra la traversa.",
+    "{player} ({team}) cerca il filtrante, ma il passaggio è troppo lungo."
+]
+
+def make_commentary(n_lines, seed=3):
+    rng = random.Random(seed)
+    comments = []
+    score = {HOME: 0, AWAY: 0}
+    for i in range(n_lines):
+        minute = 1 + i * 93 // n_lines
+        time_str = f"90+{minute - 90}'" if minute > 90 else f"{minute}'"
+        team = rng.choice([HOME, AWAY])
+        player = f"Giocatore {rng.randint(1, 22)}"
+        roll = rng.random()
+        if roll < 0.01:
+            score[team] += 1
+            comments.append({"time": time_str, "type": "soccer", "text": f"Gol! {HOME} {score[HOME]}, {AWAY} {score[AWAY]}. {player} ({team}) segna con un tiro di destro."})
+        elif roll < 0.04:
+            comments.append({"time": time_str, "type": "yellow card", "text": f"{player} ({team}) riceve un cartellino giallo per un fallo duro."})
+        elif roll < 0.12:
+            comments.append({"time": time_str, "type": "corner", "text": f"Calcio d'angolo per {team}. Conceduto da {player}."})
+        elif roll < 0.22:
+            comments.append({"time": time_str, "type": "general", "text": f"Fallo di {player} ({team})."})
+        else:
+            comments.append({"time": time_str, "type": "general", "text": rng.choice(FILLER).format(team=team, player=player)})
+    comments.reverse() # The site lists the newest line first
+    return comments
+
+def raw_commentary(comments):
+    return "Match Commentary:\n" + "".join(f"[{c['time']}] {c['type']}: {c['text']}\n" for c in comments)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the commentary digest.")
+    parser.add_argument("--lines", type=int, default=300)
+    parser.add_argument("--budget", type=int, default=1200, help="Token budget of the salient lines")
+    args = parser.parse_args()
+
+    comments = make_commentary(args.lines)
+    teams = {"home": HOME, "away": AWAY}
+
+    raw = raw_commentary(comments)
+    start = time.perf_counter()
+    digest = format_digest(comments, teams, args.budget)
+    elapsed = time.perf_counter() - start
+
+    features = digest_commentary(comments, teams)
+    print(f"Commentary lines: {len(comments)}, goals: {len(features['goals'])}, cards: {len(features['cards'])}, clusters: {len(features['clusters'])}")
+    print(f"Raw commentary: ~{len(raw) // 4} tokens")
+    print(f"Digest:         ~{len(digest) // 4} tokens ({len(raw) / len(digest):.1f}x smaller, built in {elapsed * 1000:.1f} ms)")
+    print("\n" + digest[:1500])
+
+if __name__ == "__main__":
+    main()
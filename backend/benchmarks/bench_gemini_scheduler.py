@@ -0,0 +1,61 @@
+"""
+Gemini analysis throughput against the offline FakeGemini: the old inline loop (one call at a
+time, fixed 30/60/120s-style exponential sleeps on 429) vs the shared GeminiScheduler
+(token buckets + concurrency + per-request jittered backoff).
+Time is scaled down: a "minute" of quota is --window seconds.
+
+Usage: python -m backend.benchmarks.bench_gemini_scheduler [--matches 60] [--latency 0.5] [--rpm 30] [--window 6]
+"""
+import time
+import argparse
+
+from backend.benchmarks.fake_gemini import FakeGemini
+from backend.services.gemini_scheduler import GeminiScheduler, is_rate_limit_error
+
+PROMPT = "x" * 20000 # ~5k tokens, a typical full-commentary prompt
+
+def run_sequential(gemini, n_matches, base_delay):
+    """The pre-scheduler retry loop of analyze_match_comments (base delay scaled like the window)."""
+    for _ in range(n_matches):
+        for attempt in range(5):
+            try:
+                gemini.generate_content(PROMPT)
+                break
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                time.sleep(base_delay * (2 ** attempt))
+
+def run_scheduled(gemini, n_matches, rpm, window, concurrency):
+    # Budgets per scaled minute: the bucket refills 'rpm' requests every 'window' seconds
+    scheduler = GeminiScheduler(rpm=rpm * 60 / window, tpm=1e12, max_concurrency=concurrency, base_backoff=window / 12)
+    futures = [scheduler.submit(scheduler.call, lambda: gemini.generate_content(PROMPT)) for _ in range(n_matches)]
+    for f in futures:
+        f.result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Gemini analysis throughput offline.")
+    parser.add_argument("--matches", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds per fake Gemini call")
+    parser.add_argument("--rpm", type=int, default=30, help="Fake quota: requests per window")
+    parser.add_argument("--window", type=float, default=6.0, help="Seconds standing in for one minute")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    results = {}
+    for name, run in (
+        ("sequential", lambda g: run_sequential(g, args.matches, base_delay=args.window / 2)),
+        ("scheduler", lambda g: run_scheduled(g, args.matches, args.rpm, args.window, args.concurrency))
+    ):
+        gemini = FakeGemini(latency=args.latency, rpm_limit=args.rpm, window=args.window)
+        start = time.perf_counter()
+        run(gemini)
+        elapsed = time.perf_counter() - start
+        results[name] = elapsed
+        per_minute = args.matches / elapsed * args.window
+        print(f"{name:>10}: {elapsed:6.2f}s, {per_minute:5.1f} analyses per quota minute, {gemini.rejected} rejected (429)")
+
+    print(f"Speed-up: {results['sequential'] / results['scheduler']:.1f}x")
+
+if __name__ == "__main__":
+    main()
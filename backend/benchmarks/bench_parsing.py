@@ -0,0 +1,60 @@
+"""
+Parse throughput of saved pages: html.parser vs lxml, whole page vs scoped parsing
+(backend.scraper.parsing), each followed by the select() the scraper does on that page.
+
+Usage: python -m backend.benchmarks.bench_parsing [--repeat 20] [--page path.html:scope ...]
+"""
+import os
+import time
+import argparse
+
+from backend.scraper.parsing import parse_html, SELECTORS, DEFAULT_PARSER
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Saved standings page (squads_scraper debug dump): (path, scope, selector read after parsing)
+DEFAULT_PAGES = [
+    (os.path.join(BACKEND_DIR, "debug_squads.html"), "table_rows", SELECTORS["table_rows"]),
+]
+SCOPE_SELECTORS = {
+    "table_rows": SELECTORS["table_rows"], "live_table": SELECTORS["result_rows"], "stats": SELECTORS["stat_rows"],
+    "match_header": SELECTORS["status"], "calendar": SELECTORS["calendar_rows"], "team_logo": SELECTORS["team_logo"],
+}
+
+def bench(html, parser, scope, selector, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = len(parse_html(html, scope=scope, parser=parser).select(selector))
+    return (time.perf_counter() - start) / repeat, found
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parsing backends and scoped parsing.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--page", action="append", default=[], help="Saved page as path.html:scope (scope from parsing.SCOPES)")
+    args = parser.parse_args()
+
+    pages = DEFAULT_PAGES
+    if args.page:
+        pages = []
+        for spec in args.page:
+            path, scope = spec.rsplit(":", 1)
+            pages.append((path, scope, SCOPE_SELECTORS[scope]))
+
+    parsers = ["html.parser"] + (["lxml"] if DEFAULT_PARSER == "lxml" else [])
+    if DEFAULT_PARSER != "lxml":
+        print("lxml is not installed: only html.parser is measured (pip install lxml).")
+
+    for path, scope, selector in pages:
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+        print(f"\n{os.path.basename(path)} ({len(html) / 1024:.0f} KB), scope '{scope}', select '{selector[:40]}'")
+        baseline = None
+        for p in parsers:
+            for scoped in (None, scope):
+                seconds, found = bench(html, p, scoped, selector, args.repeat)
+                baseline = baseline or seconds
+                label = f"{p} {'scoped' if scoped else 'full page'}"
+                print(f"  {label:<22} {seconds * 1000:7.1f} ms/page  {1 / seconds:6.1f} pages/s  {len(html) / seconds / 1e6:5.1f} MB/s  "
+                      f"{baseline / seconds:4.1f}x  ({found} elements)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Bytes on the wire and serialisation time of the /matches response on a realistic multi-league dataset:
+stdlib JSON (FastAPI's default path) vs orjson, gzip, ?fields= projection and 304 revalidations.
+
+Usage: python -m backend.benchmarks.bench_responses [--matches-per-league 306]
+"""
+import json
+import gzip
+import time
+import random
+import argparse
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from backend.benchmarks.fake_postgrest import make_match_rows
+
+LEAGUES = ["Eredivisie", "La Liga", "Serie B", "Serie A", "Bundesliga", "Ligue 1", "Premier League", "Eerste Divisie", "Serie A Betano"]
+TEXT_COLUMNS = ["summary_match", "detail_corner", "detail_goal", "detail_shots", "detail_fouls", "detail_cards", "detailed comment corner"]
+EXTRA_STATS = ["xg", "xgot", "big_chances", "box_touches", "crosses", "goalkeeper_saves", "blocked_shots", "possession"]
+
+# Columns requested by the frontend (see MATCH_FIELDS in useMatchData.js)
+FRONTEND_FIELDS = ["home_team", "away_team", "giornata", "league", "tl dr corner", "detailed comment corner"] + [
+    f"{side}_{stat}"
+    for stat in ["corners", "fouls", "yellow_cards", "red_cards", "shots", "shots_on_target", "goals", "possession"]
+    for side in ("home", "away")
+]
+
+WORDS = (
+    "la squadra di casa ha spinto sulle fasce di conseguenza i corner sono aumentati nonostante il possesso "
+    "palla ospite il pressing alto ha causato falli tattici e cartellini questo ha portato a un finale nervoso"
+).split()
+
+def make_dataset(matches_per_league, seed=42):
+    rng = random.Random(seed)
+    rows = make_match_rows(matches_per_league * len(LEAGUES), leagues=LEAGUES)
+    for row in rows:
+        for stat in EXTRA_STATS:
+            row[f"home_{stat}"] = round(rng.uniform(0, 3), 2) if stat.startswith("x") else rng.randint(0, 60)
+            row[f"away_{stat}"] = round(rng.uniform(0, 3), 2) if stat.startswith("x") else rng.randint(0, 60)
+        for column in TEXT_COLUMNS:
+            row[column] = " ".join(rng.choice(WORDS) for _ in range(rng.randint(120, 220)))
+        row["tl dr corner"] = " ".join(rng.choice(WORDS) for _ in range(40))
+    return rows
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /matches response size and serialisation.")
+    parser.add_argument("--matches-per-league", type=int, default=306, help="Matches per league (18-team season: 306)")
+    args = parser.parse_args()
+
+    rows = make_dataset(args.matches_per_league)
+    projected = [{k: row.get(k) for k in FRONTEND_FIELDS} for row in rows]
+
+    std_time, std_body = timed(lambda: json.dumps(jsonable_encoder(rows)).encode("utf-8"))
+    orj_time, orj_body = timed(lambda: orjson.dumps(rows))
+    gz9_time, _ = timed(lambda: gzip.compress(orj_body, compresslevel=9), repeat=3)
+    gz_time, gz_body = timed(lambda: gzip.compress(orj_body, compresslevel=6), repeat=3)
+    proj_body = orjson.dumps(projected)
+    proj_gz = gzip.compress(proj_body, compresslevel=6)
+
+    mb = lambda n: f"{n / 1_000_000:6.2f} MB"
+    print(f"Dataset: {len(rows)} matches across {len(LEAGUES)} leagues\n")
+    print("Serialisation")
+    print(f"  jsonable_encoder + json.dumps: {std_time * 1000:7.1f} ms")
+    print(f"  orjson.dumps:                  {orj_time * 1000:7.1f} ms  ({std_time / orj_time:.1f}x faster)")
+    print(f"  gzip level 9:                  {gz9_time * 1000:7.1f} ms")
+    print(f"  gzip level 6 (cached per data version): {gz_time * 1000:.1f} ms\n")
+    print("Bytes on the wire")
+    print(f"  full table:                    {mb(len(std_body))}")
+    print(f"  full table, gzip -6:           {mb(len(gz_body))}")
+    print(f"  ?fields= (frontend columns):   {mb(len(proj_body))}")
+    print(f"  ?fields=, gzip -6:             {mb(len(proj_gz))}  ({len(std_body) / len(proj_gz):.0f}x smaller)")
+    print(f"  unchanged data (304):          {mb(0)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import json
+import time
+import threading
+from collections import deque
+
+ANALYSIS_KEYS = [
+    "match_summary", "detailed_corners_analysis", "detailed_goals_analysis",
+    "detailed_shots_analysis", "detailed_fouls_analysis", "detailed_cards_analysis"
+]
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+class FakeGemini:
+    """
+    Offline stand-in for a Gemini model: fixed latency per call and a server-side
+    requests-per-minute quota (sliding window) that answers '429 Quota exceeded' like the API.
+    """
+    def __init__(self, latency=1.0, rpm_limit=15, window=60.0):
+        self.latency = latency
+        self.rpm_limit = rpm_limit
+        self.window = window
+        self.calls = 0
+        self.rejected = 0
+        self._accepted = deque()
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self._lock:
+            now = time.monotonic()
+            while self._accepted and now - self._accepted[0] > self.window:
+                self._accepted.popleft()
+            if len(self._accepted) >= self.rpm_limit:
+                self.rejected += 1
+                raise Exception("429 Quota exceeded for generate_content requests per minute")
+            self._accepted.append(now)
+            self.calls += 1
+
+        time.sleep(self.latency)
+        return FakeResponse(json.dumps({k: f"Fake analysis ({len(prompt)} chars)" for k in ANALYSIS_KEYS}))
@@ -0,0 +1,100 @@
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+class FakePostgREST:
+    """
+    Minimal local stand-in for the Supabase REST API, good enough for benchmarks:
+    serves in-memory tables with select/limit/offset, caps pages at max_rows like Supabase,
+    reports Content-Range for 'Prefer: count=exact' and adds a fixed latency per request.
+    """
+    def __init__(self, tables, latency=0.1, max_rows=1000):
+        self.tables = tables
+        self.latency = latency
+        self.max_rows = max_rows
+        self.requests_served = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _rows(self):
+                parsed = urlparse(self.path)
+                table = parsed.path.rsplit("/", 1)[-1]
+                params = parse_qs(parsed.query)
+                rows = fake.tables.get(table, [])
+
+                select = params.get("select", ["*"])[0]
+                if select != "*":
+                    cols = [c.strip().strip('"') for c in select.split(",")]
+                    rows = [{c: r.get(c) for c in cols} for r in rows]
+                return rows, params
+
+            def _send(self, status, body, total):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if "count=exact" in self.headers.get("Prefer", ""):
+                    self.send_header("Content-Range", f"*/{total}")
+                self.end_headers()
+                return body
+
+            def do_HEAD(self):
+                time.sleep(fake.latency)
+                fake.requests_served += 1
+                rows, _ = self._rows()
+                self._send(200, b"", len(rows))
+
+            def do_GET(self):
+                time.sleep(fake.latency)
+                fake.requests_served += 1
+                rows, params = self._rows()
+                offset = int(params.get("offset", [0])[0])
+                limit = min(int(params.get("limit", [fake.max_rows])[0]), fake.max_rows)
+                body = json.dumps(rows[offset:offset + limit]).encode("utf-8")
+                self.wfile.write(self._send(200, body, len(rows)))
+
+        return Handler
+
+def make_match_rows(n_rows, leagues=("Eredivisie", "Serie A", "La Liga")):
+    """Synthetic 'matches' rows shaped like the real table."""
+    stats = ["corners", "fouls", "yellow_cards", "red_cards", "shots", "shots_on_target", "goals"]
+    rows = []
+    for i in range(n_rows):
+        row = {
+            "id": i + 1,
+            "league": leagues[i % len(leagues)],
+            "giornata": (i // 9) % 38 + 1,
+            "home_team": f"Team {i % 18}",
+            "away_team": f"Team {(i + 7) % 18}",
+            "url": f"https://www.diretta.it/partita/{i:08d}/"
+        }
+        for k, stat in enumerate(stats):
+            row[f"home_{stat}"] = (i + k) % 9
+            row[f"away_{stat}"] = (i * 3 + k) % 7
+        rows.append(row)
+    return rows
@@ -1,15 +1,28 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from itertools import chain
 import os
+import gzip
+import orjson
+import hashlib
 from dotenv import load_dotenv
 
 # Import services
 # Note: We need to ensure the services directory is in the python path or imported correctly.
 # Since main.py is in backend/, and services is in backend/services/, this relative import works.
-from backend.services.gemini_analyzer import analyze_match_comments
+from backend.services.gemini_analyzer import analyze_match_comments, stream_match_analysis
+from backend.services.analysis_jobs import AnalysisQueue
+from backend.services.data_cache import VersionedCache, get_data_version, rows_size
+from backend.services.backtest_engine import evaluate_strategy
+from backend.services.strategy_sweep import run_sweeps, DEFAULT_GRID, shutdown_executor as shutdown_sweep_executor
+from backend.services.stats_engine import compute_team_stats, stat_columns, STATISTICS
+from backend.services.predictions import predict_fixtures
+from backend.services.table_reader import fetch_table, fetch_page, iter_table_pages, build_select, build_filters
 from supabase import create_client, Client
 
 load_dotenv()
@@ -17,15 +30,39 @@ load_dotenv()
 url: str = os.environ.get("SUPABASE_URL")
 key: str = os.environ.get("SUPABASE_KEY")
 supabase: Client = create_client(url, key)
+rest_headers = {"apikey": key, "Authorization": f"Bearer {key}"}
 
+MAX_PAGE_LIMIT = 5000 # Upper bound for ?limit= on the keyset-paginated endpoints
+MAX_SWEEP_COMBINATIONS = 200000 # Upper bound for the /strategy/sweep parameter grid
+
+# Full-table reads are expensive (one round trip per 1000 rows), keep them in memory until the next sync.
+# table_cache only holds encoded table responses (JSON and gzip bodies)...
+table_cache = VersionedCache(
+    maxsize=int(os.environ.get("TABLE_CACHE_SIZE", 32)),
+    ttl=int(os.environ.get("TABLE_CACHE_TTL", 300))
+)
+# ...while projected rows and computed results (stats, backtests, sweeps, predictions), whose keys
+# come from client parameters, live in a cache bounded by size so they cannot evict the tables.
+result_cache = VersionedCache(
+    maxsize=int(float(os.environ.get("RESULT_CACHE_MB", 128)) * 1024 * 1024),
+    ttl=int(os.environ.get("TABLE_CACHE_TTL", 300)),
+    getsizeof=rows_size
+)
+
+# How often the background task checks whether a sync changed matches/fixtures
+PREDICTIONS_WARM_SECONDS = float(os.environ.get("PREDICTIONS_WARM_SECONDS", 30))
+
+import asyncio
 from contextlib import asynccontextmanager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup logic can go here if needed
+    warmer = asyncio.create_task(warm_predictions_loop())
     yield
-    # Shutdown logic if needed
+    warmer.cancel()
+    analysis_queue.shutdown()
+    shutdown_sweep_executor()
 
-app = FastAPI(title="Progetto Olanda 2.0 Backend", lifespan=lifespan)
+app = FastAPI(title="Progetto Olanda 2.0 Backend", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -34,8 +71,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-After-Id", "ETag"],
 )
 
+# Match/fixture lists are large and very repetitive JSON, they compress 5-10x
+GZIP_LEVEL = 6 # Level 9 is ~2x slower on a full /matches body for a few % smaller output
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=GZIP_LEVEL)
+
 class MatchData(BaseModel):
     comments: List[Dict[str, Any]]
     stats_data: Optional[Dict[str, Any]] = None
@@ -45,65 +87,450 @@ class MatchData(BaseModel):
 def read_root():
     return {"status": "ok", "message": "Progetto Olanda Backend is running"}
 
-def fetch_all_data(table_name, order_col=None, desc=False):
-    all_rows = []
-    chunk_size = 1000
-    current_offset = 0
-    
-    while True:
-        query = supabase.table(table_name).select("*")
-        if order_col:
-            query = query.order(order_col, desc=desc)
-        
-        # Using limit doesn't offset, range is cleaner here: range includes end index
-        result = query.range(current_offset, current_offset + chunk_size - 1).execute()
-        
-        rows = result.data
-        if not rows:
-            break
-            
-        all_rows.extend(rows)
-        
-        if len(rows) < chunk_size:
-            break
-            
-        current_offset += chunk_size
-        
-        # Safety break to avoid infinite loops if something is weird
-        if current_offset > 50000:
-            break
-            
-    return all_rows
+def fetch_all_data(table_name, order_col=None, desc=False, select="*", filters=""):
+    """Reads a whole (filtered) table, fetching all its 1000-row pages concurrently."""
+    order = f"{order_col}.{'desc' if desc else 'asc'}" if order_col else None
+    return fetch_table(url, table_name, rest_headers, select=select, filters=filters, order=order)
 
-@app.get("/teams")
-def get_teams():
+def cached_fetch_all_data(table_name, order_col=None, desc=False, select="*", filters=""):
+    """fetch_all_data served through result_cache (invalidated by bump_data_version)."""
+    return result_cache.get_or_load(
+        table_name,
+        (order_col, desc, select, filters),
+        lambda: fetch_all_data(table_name, order_col, desc, select, filters)
+    )
+
+def ndjson_stream(pages):
+    """Serialises pages of rows as newline-delimited JSON, one chunk per page."""
+    for rows in pages:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+def wants_stream(request, stream):
+    return stream or "application/x-ndjson" in request.headers.get("accept", "")
+
+def version_etag(table_name, params):
+    """
+    ETag derived from the table's data version and the query, known before touching the data.
+    Returns None when no data version is available (see data_cache.VERSION_TABLE).
+    """
+    version = get_data_version(table_name)
+    if version == "0.0":
+        return None
+    digest = hashlib.sha1(repr((table_name, version, params)).encode("utf-8")).hexdigest()
+    return f'"v-{digest[:20]}"'
+
+def content_etag(body):
+    return f'"c-{hashlib.sha1(body).hexdigest()[:20]}"'
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or not etag:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+def not_modified(etag):
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def accepts_gzip(request):
+    return "gzip" in request.headers.get("accept-encoding", "")
+
+def json_response(request, body, etag=None, headers=None, gzipped_body=None):
+    """
+    Sends pre-serialised JSON with an ETag (content hash if no version ETag is given).
+    'no-cache' makes browsers revalidate every time, which costs a 304 when nothing changed.
+    A pre-compressed 'gzipped_body' is sent as is (GZipMiddleware skips encoded responses).
+    """
+    etag = etag or content_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    headers = {**(headers or {}), "ETag": etag, "Cache-Control": "no-cache"}
+    if gzipped_body is not None:
+        headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+        body = gzipped_body
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def read_table(table_name, request, order_col=None, desc=False, fields=None, limit=None, stream=False, **filter_args):
+    """
+    Shared implementation of the table endpoints. Filters and the column projection are pushed
+    down to Supabase. With 'limit' a single keyset page (ordered by id) is returned and the cursor
+    for the next one is sent in the X-Next-After-Id header.
+    In stream mode (?stream=1 or Accept: application/x-ndjson) rows are sent as NDJSON while the
+    Supabase pages arrive, without building the whole table in memory.
+    Every response carries an ETag: a matching If-None-Match is answered with 304 and, when the
+    data version is known, without loading anything.
+    """
     try:
-        data = fetch_all_data("squads")
-        return data
+        select = build_select(fields, ensure=("id",) if limit else ())
+        filters = build_filters(**filter_args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    params = (order_col, desc, select, filters)
+    streaming = wants_stream(request, stream)
+    etag = version_etag(table_name, params + (limit, streaming))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    try:
+        if limit is None and streaming:
+            headers = {"ETag": etag, "Cache-Control": "no-cache"} if etag else None
+            cached = table_cache.get(table_name, ("json",) + params)
+            if cached is not None:
+                return StreamingResponse(ndjson_stream([orjson.loads(cached)]), media_type="application/x-ndjson", headers=headers)
+
+            order = f"{order_col}.{'desc' if desc else 'asc'}" if order_col else None
+            pages = iter_table_pages(url, table_name, rest_headers, select=select, filters=filters, order=order)
+            # Fetch the first page here so that Supabase errors still become a proper 500
+            first_page = next(pages, [])
+            return StreamingResponse(ndjson_stream(chain([first_page], pages)), media_type="application/x-ndjson", headers=headers)
+
+        if limit is None:
+            body = table_cache.get_or_load(
+                table_name,
+                ("json",) + params,
+                lambda: orjson.dumps(fetch_all_data(table_name, order_col, desc, select, filters))
+            )
+            # Full tables are compressed once per data version instead of on every request
+            gzipped_body = None
+            if accepts_gzip(request):
+                gzipped_body = table_cache.get_or_load(
+                    table_name,
+                    ("gzip",) + params,
+                    lambda: gzip.compress(body, compresslevel=GZIP_LEVEL)
+                )
+            return json_response(request, body, etag, gzipped_body=gzipped_body)
+
+        def load_page():
+            rows = fetch_page(url, table_name, rest_headers, 0, limit, select, filters)
+            return orjson.dumps(rows), (rows[-1]["id"] if len(rows) == limit else None)
+
+        body, next_after_id = table_cache.get_or_load(table_name, ("page", select, filters, limit), load_page)
+        headers = {"X-Next-After-Id": str(next_after_id)} if next_after_id is not None else {}
+        if streaming:
+            return StreamingResponse(ndjson_stream([orjson.loads(body)]), media_type="application/x-ndjson", headers=headers)
+        return json_response(request, body, etag, headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/teams")
+def get_teams(
+    request: Request,
+    fields: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    stream: bool = False
+):
+    # 'squads' has no league/round/date columns, only projection and pagination apply
+    return read_table("squads", request, fields=fields, limit=limit, stream=stream, after_id=after_id)
+
 @app.get("/matches")
-def get_matches():
+def get_matches(
+    request: Request,
+    league: Optional[str] = None,
+    since_giornata: Optional[int] = None,
+    fields: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    stream: bool = False
+):
+    # The syncer does not write match_date to 'matches', so there is no since_date filter here
+    return read_table(
+        "matches", request, fields=fields, limit=limit, stream=stream,
+        league=league, since_giornata=since_giornata, after_id=after_id
+    )
+
+@app.get("/fixtures")
+def get_fixtures(
+    request: Request,
+    league: Optional[str] = None,
+    since_giornata: Optional[int] = None,
+    since_date: Optional[str] = None,
+    fields: Optional[str] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_LIMIT),
+    stream: bool = False
+):
+    return read_table(
+        "fixtures", request, order_col="match_date", fields=fields, limit=limit, stream=stream,
+        league=league, since_giornata=since_giornata, since_date=since_date, after_id=after_id
+    )
+
+@app.get("/leagues")
+def get_leagues(request: Request):
+    etag = version_etag("League", None)
+    if etag_matches(request, etag):
+        return not_modified(etag)
     try:
-        data = fetch_all_data("matches")
-        return data
+        body = table_cache.get_or_load(
+            "League",
+            ("json",),
+            lambda: orjson.dumps(supabase.table("League").select("*").execute().data)
+        )
+        return json_response(request, body, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/fixtures")
-def get_fixtures():
+def fetch_league_matches(league, statistics=STATISTICS):
+    """Cached rows of one league, projected on the columns the stats engines need."""
+    rows = cached_fetch_all_data(
+        "matches",
+        select=build_select(",".join(stat_columns(statistics) + ["id"])),
+        filters=build_filters(league=league)
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"No matches found for league '{league}'")
+    return rows
+
+def fetch_all_matches_for_stats(statistics=STATISTICS):
+    """Cached rows of every league, projected on the stats engine columns plus 'league'."""
+    return cached_fetch_all_data(
+        "matches",
+        select=build_select(",".join(stat_columns(statistics) + ["id", "league"]))
+    )
+
+def check_statistic(statistic):
+    if statistic not in STATISTICS:
+        raise HTTPException(status_code=400, detail=f"Unknown statistic '{statistic}'. Available: {STATISTICS}")
+
+def build_league_stats(league, last_n):
+    rows = fetch_league_matches(league)
+
+    return {
+        "league": league,
+        "matches": len(rows),
+        "last_n": last_n,
+        "statistics": STATISTICS,
+        "teams": compute_team_stats(rows, last_n=last_n)
+    }
+
+@app.get("/stats/{league}")
+def get_league_stats(request: Request, league: str, last_n: int = Query(5, ge=1, le=50)):
+    """
+    Per-team aggregates (mean, median, std, last N) of every statistic, home/away/overall.
+    Computed once per data version with the vectorised stats engine.
+    """
+    etag = version_etag("matches", ("stats", league, last_n))
+    if etag_matches(request, etag):
+        return not_modified(etag)
     try:
-        data = fetch_all_data("fixtures", "match_date", desc=False)
-        return data
+        body = result_cache.get_or_load(
+            "matches",
+            ("stats", league, last_n),
+            lambda: orjson.dumps(build_league_stats(league, last_n))
+        )
+        return json_response(request, body, etag)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/leagues")
-def get_leagues():
+@app.get("/backtest/{league}")
+def get_backtest(
+    request: Request,
+    league: str,
+    statistic: str = "corners",
+    n_games: str = "5",
+    force_mean: bool = False,
+    use_general_stats: bool = False,
+    soft_buffer: float = 0,
+    min_prediction: float = 0,
+    max_line_cap: Optional[float] = None
+):
+    """
+    Walk-forward backtest of one strategy (same model and betting rule as evaluateStrategy
+    in the frontend), computed in a single linear pass per data version.
+    """
+    check_statistic(statistic)
+    model_params = {"nGames": n_games, "forceMean": force_mean, "useGeneralStats": use_general_stats}
+    betting_params = {"softBuffer": soft_buffer, "minPrediction": min_prediction, "maxLineCap": max_line_cap}
+    cache_params = ("backtest", league, statistic, tuple(model_params.items()), tuple(betting_params.items()))
+
+    etag = version_etag("matches", cache_params)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    try:
+        body = result_cache.get_or_load(
+            "matches",
+            cache_params,
+            lambda: orjson.dumps({
+                "league": league,
+                "statistic": statistic,
+                "modelParams": model_params,
+                "bettingParams": betting_params,
+                **evaluate_strategy(fetch_league_matches(league, [statistic]), statistic, model_params, betting_params)
+            })
+        )
+        return json_response(request, body, etag)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def parse_grid_values(raw, cast, name, allow=()):
+    """
+    '0,0.5,1' -> [0.0, 0.5, 1.0]. The sentinels in 'allow' are accepted too: 'none' becomes
+    None (no cap), 'all' stays 'all' (whole history).
+    """
+    values = []
+    for item in raw.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        if item in allow:
+            values.append(None if item == "none" else "all")
+            continue
+        try:
+            values.append(cast(item))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid value '{item}' for {name}")
+    if not values:
+        raise HTTPException(status_code=400, detail=f"Empty grid for {name}")
+    return values
+
+@app.get("/strategy/sweep")
+def get_strategy_sweep(
+    request: Request,
+    leagues: Optional[str] = None,
+    statistics: str = "corners",
+    n_games: str = ",".join(str(n) for n in DEFAULT_GRID["n_games"]),
+    soft_buffer: str = ",".join(str(b) for b in DEFAULT_GRID["soft_buffer"]),
+    min_prediction: str = "0",
+    max_line_cap: str = "none",
+    top: int = Query(10, ge=1, le=100)
+):
+    """
+    Best betting strategies per league x statistic over a dense grid of model and betting
+    parameters (comma separated lists). Computed once per data version, so the "best strategy"
+    panels are a lookup instead of running findBestStrategy in the browser.
+    """
+    stat_list = [st.strip() for st in statistics.split(",") if st.strip()]
+    for statistic in stat_list:
+        check_statistic(statistic)
+
+    grid = {
+        "n_games": parse_grid_values(n_games, int, "n_games", allow=("all",)),
+        "force_mean": DEFAULT_GRID["force_mean"],
+        "use_general_stats": DEFAULT_GRID["use_general_stats"],
+        "soft_buffer": parse_grid_values(soft_buffer, float, "soft_buffer"),
+        "min_prediction": parse_grid_values(min_prediction, float, "min_prediction"),
+        "max_line_cap": parse_grid_values(max_line_cap, float, "max_line_cap", allow=("none",))
+    }
+    grid_size = 1
+    for values in grid.values():
+        grid_size *= len(values)
+    if grid_size > MAX_SWEEP_COMBINATIONS:
+        raise HTTPException(status_code=400, detail=f"Grid too large ({grid_size} > {MAX_SWEEP_COMBINATIONS} combinations)")
+
+    league_list = sorted({l.strip() for l in leagues.split(",") if l.strip()}) if leagues else None
+    cache_params = ("sweep", tuple(league_list or ()), tuple(stat_list), tuple((k, tuple(v)) for k, v in grid.items()), top)
+
+    etag = version_etag("matches", cache_params)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    def compute():
+        rows_by_league = {}
+        for row in fetch_all_matches_for_stats(stat_list):
+            if row.get("league") and (league_list is None or row["league"] in league_list):
+                rows_by_league.setdefault(row["league"], []).append(row)
+        if not rows_by_league:
+            raise HTTPException(status_code=404, detail="No matches found for the requested leagues")
+        return orjson.dumps(run_sweeps(rows_by_league, stat_list, grid, top))
+
     try:
-        response = supabase.table("League").select("*").execute()
-        return response.data
+        body = result_cache.get_or_load("matches", cache_params, compute)
+        return json_response(request, body, etag)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+PREDICTION_FIXTURE_FIELDS = "id,home_team,away_team,match_date,giornata,league,status"
+AGGREGATORS = ("auto", "mean", "median")
+
+def predictions_params(stat_list, n_games, adjusted, use_general_stats, aggregator, league):
+    """
+    Cache key of a /predictions query. Includes the fixtures version (the cache is keyed on
+    'matches') and the current hour, since "upcoming" moves with the clock.
+    """
+    return (
+        "predictions", get_data_version("fixtures"), datetime.now().strftime("%Y-%m-%dT%H"),
+        tuple(stat_list), str(n_games), adjusted, use_general_stats, aggregator, league
+    )
+
+def build_predictions(stat_list, n_games, adjusted, use_general_stats, aggregator, league):
+    matches = fetch_all_matches_for_stats(stat_list)
+    fixtures = cached_fetch_all_data("fixtures", order_col="match_date", select=PREDICTION_FIXTURE_FIELDS)
+    if league:
+        matches = [m for m in matches if m.get("league") == league]
+        fixtures = [f for f in fixtures if f.get("league") == league]
+
+    return {
+        "statistics": stat_list,
+        "nGames": n_games,
+        "adjusted": adjusted,
+        "useGeneralStats": use_general_stats,
+        "aggregator": aggregator,
+        "fixtures": predict_fixtures(matches, fixtures, stat_list, n_games, adjusted, use_general_stats, aggregator)
+    }
+
+def cached_predictions(stat_list, n_games="5", adjusted=False, use_general_stats=False, aggregator="auto", league=None):
+    params = predictions_params(stat_list, n_games, adjusted, use_general_stats, aggregator, league)
+    return params, result_cache.get_or_load(
+        "matches",
+        params,
+        lambda: orjson.dumps(build_predictions(stat_list, n_games, adjusted, use_general_stats, aggregator, league))
+    )
+
+async def warm_predictions_loop():
+    """
+    Recomputes the default /predictions body as soon as a sync bumps matches or fixtures,
+    so the first visitor after a sync does not pay for the full-table reads.
+    """
+    last_versions = None
+    while True:
+        # get_data_version may poll Supabase over HTTP: keep it off the event loop
+        versions = await asyncio.to_thread(lambda: (get_data_version("matches"), get_data_version("fixtures")))
+        if versions != last_versions:
+            try:
+                await asyncio.to_thread(cached_predictions, STATISTICS)
+                last_versions = versions
+                print(f"🔥 Predictions cache warmed (data versions {versions})")
+            except Exception as e:
+                print(f"⚠️ Could not warm predictions cache: {e}")
+        await asyncio.sleep(PREDICTIONS_WARM_SECONDS)
+
+@app.get("/predictions")
+def get_predictions(
+    request: Request,
+    statistics: Optional[str] = None,
+    n_games: str = "5",
+    adjusted: bool = False,
+    use_general_stats: bool = False,
+    aggregator: str = "auto",
+    league: Optional[str] = None
+):
+    """
+    Expected home/away/total and standard deviations (same model as calculatePrediction)
+    for every upcoming fixture and statistic, in one batch per data version.
+    aggregator: 'auto' (median for volatile stats), 'mean' or 'median'.
+    """
+    stat_list = [st.strip() for st in statistics.split(",") if st.strip()] if statistics else STATISTICS
+    for statistic in stat_list:
+        check_statistic(statistic)
+    if aggregator not in AGGREGATORS:
+        raise HTTPException(status_code=400, detail=f"Unknown aggregator '{aggregator}'. Available: {list(AGGREGATORS)}")
+
+    etag = version_etag("matches", predictions_params(stat_list, n_games, adjusted, use_general_stats, aggregator, league))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    try:
+        _, body = cached_predictions(stat_list, n_games, adjusted, use_general_stats, aggregator, league)
+        return json_response(request, body, etag)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -114,18 +541,62 @@ def keep_alive():
     """
     return {"status": "alive", "timestamp": datetime.now().isoformat()}
 
-@app.post("/analyze")
+# Gemini calls (and their rate-limit backoff) run here, never on a request thread
+analysis_queue = AnalysisQueue(analyze_match_comments)
+SSE_KEEPALIVE_SECONDS = 15
+
+@app.post("/analyze", status_code=202)
 def analyze_match(data: MatchData):
     """
-    Analyzes match comments using Gemini.
+    Queues a Gemini analysis of the match comments and returns its job id immediately.
+    Poll GET /analyze/{job_id} or listen on GET /analyze/{job_id}/events for the result.
     """
-    try:
-        result = analyze_match_comments(data.comments, data.stats_data, data.teams)
-        if "error" in result:
-             raise HTTPException(status_code=500, detail=result["error"])
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    job, created = analysis_queue.submit(data.model_dump())
+    if job is None:
+        raise HTTPException(status_code=503, detail="Too many analyses pending, retry later")
+    return {"job_id": job.id, "status": job.status, "deduplicated": not created}
+
+def get_analysis_job(job_id):
+    job = analysis_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired analysis job '{job_id}'")
+    return job
+
+@app.post("/analyze/stream")
+async def analyze_match_stream(data: MatchData):
+    """
+    Server-sent events variant of /analyze: one 'section' event ({key, value}) per field of the
+    analysis as soon as the model has written it, then 'done' with the whole result (or 'error').
+    """
+    async def events():
+        sections = stream_match_analysis(data.comments, data.stats_data, data.teams)
+        # Each chunk is pulled in a worker thread: waits on the Gemini budgets and 429 backoffs
+        # must not hold a thread of the shared request threadpool
+        while (item := await asyncio.to_thread(next, sections, None)) is not None:
+            kind, key, value = item
+            payload = {"key": key, "value": value} if kind == "section" else value
+            if kind == "error":
+                payload = {"error": value}
+            yield f"event: {kind}\ndata: {orjson.dumps(payload).decode()}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.get("/analyze/{job_id}")
+def get_analysis(job_id: str):
+    return get_analysis_job(job_id).to_dict()
+
+@app.get("/analyze/{job_id}/events")
+async def get_analysis_events(job_id: str):
+    """Server-sent events: one 'status' event, then 'done' or 'error' when the job finishes."""
+    job = get_analysis_job(job_id)
+
+    async def events():
+        yield f"event: status\ndata: {orjson.dumps({'status': job.status}).decode()}\n\n"
+        while not await asyncio.to_thread(job.done.wait, SSE_KEEPALIVE_SECONDS):
+            yield ": keep-alive\n\n"
+        yield f"event: {job.status}\ndata: {orjson.dumps(job.to_dict()).decode()}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 if __name__ == "__main__":
     import uvicorn
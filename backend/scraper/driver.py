@@ -1,9 +1,26 @@
-import time
-import subprocess
+import os
 import re
+import json
+import shutil
+import subprocess
+import threading
 import undetected_chromedriver as uc
+from .waits import wait_for_dom_quiet
+from .network_profile import apply_profile, chrome_prefs
 
-def get_chrome_major_version():
+# Detected Chrome version and the patched chromedriver are cached here, across processes
+DRIVER_CACHE_DIR = os.environ.get(
+    "SCRAPER_DRIVER_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "chromedriver")
+)
+VERSION_CACHE_PATH = os.path.join(DRIVER_CACHE_DIR, "chrome_version.json")
+
+# Without a cached binary, undetected-chromedriver downloads and patches one on start-up:
+# that first start is serialised so concurrent starts (worker pools) share its result.
+_driver_lock = threading.Lock()
+_version_memo = {}
+
+def detect_chrome_major_version():
     try:
         output = subprocess.check_output(['google-chrome', '--version'], stderr=subprocess.STDOUT).decode('utf-8')
         version = re.search(r'(\d+)\.', output).group(1)
@@ -19,7 +36,58 @@ def get_chrome_major_version():
             print(f"Warning: Could not detect Chrome version via 'chrome --version': {e2}")
             return None
 
-def make_driver():
+def _chrome_binary_key():
+    """Path + mtime of the Chrome binary: a Chrome update invalidates the cached version."""
+    for name in ('google-chrome', 'chrome'):
+        path = shutil.which(name)
+        if path:
+            path = os.path.realpath(path)
+            return f"{path}:{os.path.getmtime(path):.0f}"
+    return None
+
+def get_chrome_major_version():
+    """Chrome major version, detected once per Chrome install (memo + file cache)."""
+    key = _chrome_binary_key()
+    if key is None:
+        return detect_chrome_major_version()
+    if key in _version_memo:
+        return _version_memo[key]
+
+    try:
+        with open(VERSION_CACHE_PATH, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (FileNotFoundError, ValueError):
+        cached = {}
+    version = cached.get(key)
+    if version is None:
+        version = detect_chrome_major_version()
+        if version is not None:
+            try:
+                os.makedirs(DRIVER_CACHE_DIR, exist_ok=True)
+                with open(VERSION_CACHE_PATH, "w", encoding="utf-8") as f:
+                    json.dump({key: version}, f)
+            except OSError as e:
+                print(f"Warning: Could not cache the Chrome version: {e}")
+    _version_memo[key] = version
+    return version
+
+def cached_driver_path(chrome_version):
+    return os.path.join(DRIVER_CACHE_DIR, f"chromedriver-{chrome_version or 'default'}")
+
+def _store_patched_driver(driver, target):
+    """Keeps the chromedriver undetected-chromedriver just patched, for every later start."""
+    source = getattr(getattr(driver, "patcher", None), "executable_path", None)
+    if not source or not os.path.exists(source):
+        return
+    try:
+        os.makedirs(DRIVER_CACHE_DIR, exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        shutil.copy2(source, tmp)
+        os.replace(tmp, target) # Atomic: concurrent processes never see a partial binary
+    except OSError as e:
+        print(f"Warning: Could not cache the patched chromedriver: {e}")
+
+def make_options():
     options = uc.ChromeOptions()
     options.add_argument("--window-size=1920,1080")
     options.add_argument("--no-sandbox")
@@ -34,23 +102,214 @@ def make_driver():
     options.add_argument("--disable-extensions")
     options.add_argument("--disable-dev-shm-usage")
 
+    # We only read text from the DOM: images, fonts, media, ads and trackers are not loaded
+    prefs = chrome_prefs()
+    if prefs:
+        options.add_experimental_option("prefs", prefs)
+    return options
+
+def make_driver():
+    options = make_options()
     chrome_version = get_chrome_major_version()
     if chrome_version:
         print(f"  -> Detected Chrome version {chrome_version}. Passing to undetected-chromedriver.")
-        driver = uc.Chrome(options=options, version_main=chrome_version)
     else:
         print("  -> Could not detect Chrome version. Using default.")
-        driver = uc.Chrome(options=options)
-    
+
+    # Warm start: the cached patched binary skips uc's download + patch step
+    executable = cached_driver_path(chrome_version)
+    driver = None
+    if os.path.exists(executable):
+        try:
+            driver = uc.Chrome(options=options, version_main=chrome_version, driver_executable_path=executable)
+        except Exception as e:
+            print(f"  -> Cached chromedriver failed ({e}). Patching a fresh one.")
+            try:
+                os.remove(executable)
+            except OSError:
+                pass
+            options = make_options()
+
+    if driver is None:
+        with _driver_lock:
+            if os.path.exists(executable):
+                driver = uc.Chrome(options=options, version_main=chrome_version, driver_executable_path=executable)
+            else:
+                driver = uc.Chrome(options=options, version_main=chrome_version)
+                _store_patched_driver(driver, executable)
+
+    apply_profile(driver)
     return driver
 
+def driver_alive(driver):
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+def quit_driver(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+class DriverPool:
+    """
+    Idle browsers shared by the scrape jobs of one process (e.g. several leagues): a finished
+    job hands its browser to the next one instead of quitting it and paying a new start-up.
+    With warm > 0 (opt-in, each one is a whole Chrome kept in memory) that many browsers are
+    kept launched in the background, so a restart (new league, --batch-size restart, crashed
+    worker) swaps in a ready instance.
+    """
+    def __init__(self, max_idle=4, warm=0):
+        self.max_idle = max(max_idle, warm)
+        self.warm = warm
+        self.idle = []
+        self._warming = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self.prewarm()
+
+    def prewarm(self):
+        """Starts background launches until warm browsers are idle or on their way."""
+        with self._cond:
+            missing = 0 if self._closed else self.warm - len(self.idle) - self._warming
+            self._warming += max(0, missing)
+        for _ in range(missing):
+            threading.Thread(target=self._launch, daemon=True).start()
+
+    def _launch(self):
+        try:
+            driver = make_driver()
+        except Exception as e:
+            print(f"  -> ⚠️ Could not pre-launch a browser: {e}")
+            driver = None
+        with self._cond:
+            self._warming -= 1
+            if driver is not None and not self._closed and len(self.idle) < self.max_idle:
+                self.idle.append(driver)
+                driver = None
+            self._cond.notify_all()
+        if driver is not None:
+            quit_driver(driver)
+
+    def acquire(self):
+        while True:
+            with self._cond:
+                # A browser already launching is ready sooner than a new cold start
+                while not self.idle and self._warming:
+                    self._cond.wait()
+                driver = self.idle.pop() if self.idle else None
+            if driver is None:
+                driver = make_driver()
+            elif not driver_alive(driver):
+                quit_driver(driver)
+                continue
+            self.prewarm() # Replace the browser just handed out
+            return driver
+
+    def release(self, driver):
+        if driver is None:
+            return
+        with self._cond:
+            if not self._closed and driver_alive(driver) and len(self.idle) < self.max_idle:
+                self.idle.append(driver)
+                self._cond.notify_all()
+                return
+        quit_driver(driver)
+
+    def close(self, timeout=60):
+        """Quits idle browsers, waiting (up to timeout) for the ones still launching."""
+        with self._cond:
+            self._closed = True
+            self._cond.wait_for(lambda: not self._warming, timeout)
+            idle, self.idle = self.idle, []
+        for driver in idle:
+            quit_driver(driver)
+
 def fully_scroll(driver, pause=0, max_loops=8):
+    """
+    Scrolls down to trigger lazy loading. After each step it waits (up to 'pause' seconds) only
+    until the DOM settles, and it stops once the bottom of the page is reached.
+    """
     loops = 0
     while loops < max_loops:
         try:
             driver.execute_script("window.scrollBy(0, 850);")
-            time.sleep(pause)
+            if pause:
+                wait_for_dom_quiet(driver, quiet=0.3, name="scroll", timeout=pause)
             loops += 1
+            # Checked after the wait: lazy-loaded rows make the page longer again
+            if driver.execute_script("return window.innerHeight + window.scrollY >= document.body.scrollHeight - 2;"):
+                break
         except Exception as e:
             print(f"  [WARNING] Scroll failed at loop {loops}/{max_loops}: {e}. Stopping scroll.")
             break
+
+class TabPool:
+    """
+    Several tabs of one browser: pages are started in background tabs (prefetch) while the
+    current tab is parsed, and open() switches to a tab only when its page is needed. Overlaps
+    network waits with parsing at a fraction of the memory of extra browser instances.
+    """
+    def __init__(self, driver, tabs=3):
+        self.driver = driver
+        self.handles = [driver.current_window_handle]
+        for _ in range(max(1, tabs) - 1):
+            driver.switch_to.new_window('tab')
+            apply_profile(driver) # DevTools settings are per tab
+            self.handles.append(driver.current_window_handle)
+        self.loading = {} # url -> handle of the tab loading it
+        self.free = list(self.handles)
+
+    def prefetch(self, url):
+        """Starts loading url in a free tab without waiting for it. False if no tab is free."""
+        if url in self.loading:
+            return True
+        if not self.free:
+            return False
+        handle = self.free.pop(0)
+        self.driver.switch_to.window(handle)
+        # Assigning location returns immediately, unlike driver.get()
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+        self.loading[url] = handle
+        return True
+
+    def open(self, url):
+        """Switches to the tab holding url, loading it there first if it was not prefetched."""
+        handle = self.loading.get(url)
+        if handle is None:
+            if self.free:
+                handle = self.free.pop(0)
+            else:
+                # Every tab is busy: take over the oldest prefetch (it is reloaded when needed)
+                oldest = next(iter(self.loading))
+                handle = self.loading.pop(oldest)
+            self.driver.switch_to.window(handle)
+            self.driver.get(url)
+            self.loading[url] = handle
+        else:
+            self.driver.switch_to.window(handle)
+
+    def release(self, url):
+        """Marks the tab of url as free again (blanked, so it stops running the page's scripts)."""
+        handle = self.loading.pop(url, None)
+        if handle is None or handle in self.free:
+            return
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.execute_script("window.location.href = 'about:blank';")
+        except Exception:
+            pass
+        self.free.append(handle)
+
+    def close(self):
+        """Closes the extra tabs, leaving the browser with its first one (e.g. before reuse)."""
+        for handle in self.handles[1:]:
+            try:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            except Exception:
+                pass
+        self.driver.switch_to.window(self.handles[0])
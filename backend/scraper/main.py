@@ -14,30 +14,45 @@ backend_dir = os.path.dirname(os.path.dirname(current_dir))
 if backend_dir not in sys.path:
     sys.path.append(backend_dir)
 
-from backend.services.gemini_analyzer import analyze_match_comments
-from backend.services.supabase_syncer import sync_matches_to_supabase, fetch_existing_urls
+from backend.services.gemini_analyzer import submit_analysis
+from backend.services.supabase_syncer import sync_matches_to_supabase, fetch_existing_urls, store_match_commentary
 
 from .config import LEAGUE_URLS
-from .driver import make_driver
+from .driver import DriverPool
 from .url_collector import fetch_match_urls
-from .match_details import scrape_match_details
+from .worker_pool import ScrapeWorkerPool
 
-def main():
-    parser = argparse.ArgumentParser(description="Scrape match data for Eredivisie, La Liga, or Serie B.")
-    parser.add_argument("league", nargs="?", default="eredivisie", choices=["eredivisie", "laliga", "serieb", "seriea", "bundesliga", "ligue1", "premier", "eerstedivisie", "betano"], help="League to scrape")
+def collect_analyses(matches, futures):
+    """Waits for the queued Gemini analyses of these matches and stores them on the match dicts."""
+    for details in matches:
+        future = futures.pop(details['url'], None)
+        if future is not None:
+            details['gemini_analysis'] = future.result()
+
+def add_scrape_arguments(parser):
+    """Options shared by this entry point and the multi-league orchestrator."""
     parser.add_argument("--limit", type=int, default=None, help="Limit number of matches to scrape")
     parser.add_argument("--skip-analysis", action="store_true", help="Skip Gemini analysis")
     parser.add_argument("--skip-sync", action="store_true", help="Skip syncing to Supabase")
     parser.add_argument("--last-round", action="store_true", help="Scrape only the most recent round")
     parser.add_argument("--force-rescrape", action="store_true", help="Force rescraping of matches even if they exist in DB")
-    parser.add_argument("--match-urls", nargs="+", help="List of specific match URLs to scrape (ignores league/limit settings)")
+    parser.add_argument("--full-discovery", action="store_true", help="Load the whole season's match list even if the latest rounds are already in DB")
 
     parser.add_argument("--batch-size", type=int, default=30, help="Restart browser and sync every N matches (default: 30)")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel browser instances for match details (default: 1)")
+    parser.add_argument("--tabs", type=int, default=1, help="Tabs per browser, the next matches load in the background (default: 1)")
+    parser.add_argument("--warm-browsers", type=int, default=int(os.environ.get("SCRAPER_WARM_BROWSERS", 0)),
+                        help="Browsers kept pre-launched for restarts, each one costs a Chrome's memory (default: 0)")
 
-    args = parser.parse_args()
-    
-    league_name = args.league
+def scrape_league(league_name, args, existing_urls=None, driver_pool=None):
+    """
+    Scrapes (and syncs) one league with the given CLI options. existing_urls and driver_pool
+    can be shared by several leagues; when omitted they are fetched/started here (with
+    --warm-browsers the pool keeps browsers ready, so batch restarts skip the cold start).
+    Returns the number of matches scraped.
+    """
     target_url = LEAGUE_URLS[league_name]
+    match_urls = getattr(args, "match_urls", None)
     
     # Serie B specific logic
     is_serieb = league_name == "serieb" or league_name == "eerstedivisie"
@@ -47,81 +62,76 @@ def main():
     if is_serieb:
         print("    -> Serie B/Eerste detected: Skipping comment scraping.")
 
-    driver = make_driver()
+    own_pool = driver_pool is None
+    if own_pool:
+        driver_pool = DriverPool(max_idle=max(1, args.workers), warm=args.warm_browsers)
+    driver = driver_pool.acquire()
     
     try:
         print("--- STEP 0: Checking Existing Matches ---")
-        existing_urls = set()
-        if not args.skip_sync and not args.force_rescrape:
-            existing_urls = fetch_existing_urls(league_slug=league_name)
+        if existing_urls is None:
+            existing_urls = set()
+            if not args.skip_sync and not args.force_rescrape:
+                existing_urls = fetch_existing_urls(league_slug=league_name)
         
         print("\n--- STEP 1: Fetching Match List ---")
-        if args.match_urls:
-            print(f"    -> Using {len(args.match_urls)} provided MATCH URLs.")
+        if match_urls:
+            print(f"    -> Using {len(match_urls)} provided MATCH URLs.")
             # Construct meta objects for specific URLs. 
             # We use '999' as a placeholder for Giornata since we don't know it yet, 
             # and it's required for the data structure.
-            all_games_meta = [{'url': url, 'giornata': 'Giornata 999'} for url in args.match_urls]
+            all_games_meta = [{'url': url, 'giornata': 'Giornata 999'} for url in match_urls]
         else:
-            all_games_meta = fetch_match_urls(driver, target_url, last_round_only=args.last_round)
+            # Stop expanding the results page at the first round already in DB
+            known_urls = None if args.full_discovery else existing_urls
+            all_games_meta = fetch_match_urls(driver, target_url, last_round_only=args.last_round, known_urls=known_urls)
             print(f"\nFound {len(all_games_meta)} matches.")
         
         print("\n--- STEP 2: Scraping Details ---")
         all_games_full_data = [] # Keep all for local JSON dump if needed
         current_batch = []       # Batch for incremental sync
+        analysis_futures = {}    # url -> pending Gemini analysis, resolved before each sync
 
-        for i, game in enumerate(all_games_meta): 
-            if args.limit and len(all_games_full_data) >= args.limit:
-                break
-            
-            # --- BATCH MANAGEMENT ---
-            # Restart driver every N matches to prevent timeouts/memory leaks
-            if i > 0 and i % args.batch_size == 0:
-                print(f"\n[Batch] Reached {i} matches processed.")
-                
-                # Sync current batch if not skipping
-                if not args.skip_sync and current_batch:
-                    print(f"    -> Syncing batch of {len(current_batch)} matches to Supabase...")
-                    sync_matches_to_supabase(data_list=current_batch)
-                    current_batch = [] # Clear batch after sync
-                
-                print("    -> Restarting browser to free resources...")
-                driver.quit()
-                import time
-                time.sleep(2)
-                driver = make_driver()
-                print("    -> Browser restarted.")
-            # ------------------------
-
+        todo = []
+        for game in all_games_meta:
             match_url = game['url']
-            
+
             # If match_urls are provided, we force rescrape them (ignore existing_urls check for them)
             # Or if force_rescrape flag is on.
-            should_force = args.force_rescrape or (args.match_urls and match_url in args.match_urls)
-            
+            should_force = args.force_rescrape or (match_urls and match_url in match_urls)
+
             if match_url in existing_urls and not should_force:
                 print(f"  -> Skipping (Already in DB): {match_url}")
                 continue
+            todo.append(game)
+        if args.limit:
+            todo = todo[:args.limit]
+
+        # The pool takes over the discovery browser (worker 0) and restarts browsers every batch
+        print(f"    -> Scraping {len(todo)} matches with {args.workers} browser worker(s), {args.tabs} tab(s) each.")
+        pool = ScrapeWorkerPool(
+            workers=args.workers, skip_comments=skip_comments, restart_every=args.batch_size,
+            first_driver=driver, tabs=args.tabs, driver_pool=driver_pool
+        )
+        driver = None
+
+        for i, (game, details) in enumerate(pool.scrape(todo)):
+            print(f"\nMatch {i+1}/{len(todo)}: {game['url']}")
 
-            print(f"\nMatch {i+1}/{len(all_games_meta)}")
-            
-            details = scrape_match_details(driver, match_url, skip_comments=skip_comments)
-            
             if details:
+                match_url = game['url']
                 details['giornata'] = game['giornata']
-                details['url'] = game['url']
+                details['url'] = match_url
                 details['league'] = league_name # Add league field for clarity
-                
+
                 # --- GEMINI ANALYSIS ---
                 # Skip analysis for Serie B if comments are missing, or if explicitly skipped
                 if not args.skip_analysis and not is_serieb:
-                    print("    -> Requesting Gemini analysis...")
+                    # Runs concurrently within the Gemini budget while the next matches are scraped
+                    print("    -> Queued Gemini analysis.")
                     stats = details.get('stats', {})
                     teams = details.get('squadre', {})
-                    analysis = analyze_match_comments(details.get('commenti', []), stats_data=stats, teams=teams)
-                    del details['commenti'] 
-                    details['gemini_analysis'] = analysis
-                    print("    -> Analysis complete.")
+                    analysis_futures[match_url] = submit_analysis(details.get('commenti', []), stats_data=stats, teams=teams)
                 elif is_serieb:
                      print("    -> Skipping Gemini analysis (Serie B / No comments).")
                      if 'commenti' in details:
@@ -132,22 +142,51 @@ def main():
                 all_games_full_data.append(details)
                 current_batch.append(details)
 
+            # --- BATCH MANAGEMENT ---
+            # Sync every N matches so an interrupted run keeps what it scraped
+            if (i + 1) % args.batch_size == 0:
+                print(f"\n[Batch] Reached {i + 1} matches processed.")
+                if not args.skip_sync and current_batch:
+                    collect_analyses(current_batch, analysis_futures)
+                    store_match_commentary(current_batch)
+                    print(f"    -> Syncing batch of {len(current_batch)} matches to Supabase...")
+                    sync_matches_to_supabase(data_list=current_batch)
+                    current_batch = [] # Clear batch after sync
+            # ------------------------
+
         # Sync any remaining matches in the final batch
         if not args.skip_sync and current_batch:
+            collect_analyses(current_batch, analysis_futures)
+            store_match_commentary(current_batch)
             print(f"\n--- Syncing final batch of {len(current_batch)} matches ---")
             sync_matches_to_supabase(data_list=current_batch)
         
         # Handle file dump if sync was skipped
         if args.skip_sync and all_games_full_data:
+            collect_analyses(all_games_full_data, analysis_futures)
             output_file = f"{league_name}_matches.json"
             with open(output_file, "w", encoding="utf-8") as f:
                 json.dump(all_games_full_data, f, indent=4, ensure_ascii=False)
             print(f"\n✅ Saved {len(all_games_full_data)} matches to {output_file} (Sync skipped)")
         elif not all_games_full_data and not current_batch:
             print("No matches scraped.")
+
+        return len(all_games_full_data)
                 
     finally:
-        driver.quit()
+        if driver:
+            driver_pool.release(driver)
+        if own_pool:
+            driver_pool.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape match data for Eredivisie, La Liga, or Serie B.")
+    parser.add_argument("league", nargs="?", default="eredivisie", choices=list(LEAGUE_URLS), help="League to scrape")
+    parser.add_argument("--match-urls", nargs="+", help="List of specific match URLs to scrape (ignores league/limit settings)")
+    add_scrape_arguments(parser)
+
+    args = parser.parse_args()
+    scrape_league(args.league, args)
 
 if __name__ == "__main__":
     main()
@@ -1,37 +1,131 @@
+import os
 import time
-from bs4 import BeautifulSoup
+import threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from .parsing import parse_html, SELECTORS
+from .waits import wait_for_dom_quiet
+from .network_profile import record_page
 
-def scrape_basic_info(soup):
-    """Extracts Team names and Score from the header."""
-    try:
-        home_team = soup.select_one('div.duelParticipant__home .participant__participantName')
-        away_team = soup.select_one('div.duelParticipant__away .participant__participantName')
-        
-        # Score extraction
-        score_home = "0"
-        score_away = "0"
-        
-        score_wrapper = soup.select_one('div.detailScore__wrapper')
-        if score_wrapper:
-            spans = score_wrapper.select('span')
-            if len(spans) >= 3: # home - away
-                score_home = spans[0].text.strip()
-                score_away = spans[2].text.strip()
-        
-        return {
-            "home": home_team.text.strip() if home_team else "N/A",
-            "away": away_team.text.strip() if away_team else "N/A",
-            "score_home": score_home,
-            "score_away": score_away
-        }
-    except Exception as e:
-        print(f"    Error scraping teams/score: {e}")
-        return {}
+# 'js': one execute_script per page view returning compact JSON (default).
+# 'soup': page_source + BeautifulSoup, also used as fallback when a script fails.
+EXTRACTION_MODE = os.environ.get("SCRAPER_EXTRACTION", "js").lower()
+
+# Same selectors as the BeautifulSoup parsers below (passed as arguments[0]), evaluated in the browser
+HEADER_SCRIPT = """
+var S = arguments[0];
+function text(sel) { var el = document.querySelector(sel); return el ? el.textContent.trim() : null; }
+var spans = Array.from(document.querySelectorAll(S.score_spans));
+return {
+    status: text(S.status),
+    home: text(S.home_team),
+    away: text(S.away_team),
+    score: spans.length >= 3 ? [spans[0].textContent.trim(), spans[2].textContent.trim()] : null
+};
+"""
+
+STATS_SCRIPT = """
+var S = arguments[0], rows = [];
+document.querySelectorAll(S.stat_rows).forEach(function (div) {
+    var category = div.querySelector(S.stat_category);
+    var values = div.querySelectorAll(S.stat_value);
+    if (category && values.length >= 2) {
+        rows.push([category.textContent.trim(), values[0].textContent.trim(), values[1].textContent.trim()]);
+    }
+});
+return rows;
+"""
+
+COMMENTS_SCRIPT = """
+var S = arguments[0], comments = [];
+document.querySelectorAll(S.comment_headline).forEach(function (headline) {
+    var row = headline.parentElement ? headline.parentElement.closest('div') : null;
+    if (!row) return;
+    var timeNode = headline.querySelector('strong');
+    var icon = headline.querySelector(S.comment_icon);
+    var textNode = row.querySelector(S.comment_title);
+    comments.push({
+        time: timeNode ? timeNode.textContent.trim() : 'N/A',
+        type: icon ? icon.getAttribute('data-testid').replace('wcl-icon-incidents-', '').replace(/-/g, ' ') : 'general',
+        text: textNode ? textNode.textContent.trim() : ''
+    });
+});
+return comments;
+"""
+
+_timings = {} # mode -> [seconds, extractions], for extraction_summary()
+_timings_lock = threading.Lock()
 
-def scrape_stats(driver):
+def extract(driver, script, soup_parser, timing=None, scope=None):
+    """
+    Runs an extraction script in the browser and returns its JSON result; falls back to
+    soup_parser(parse_html(page_source, scope)), which returns the same shape. The time spent is
+    added to timing['seconds'] (per match) and to the per-mode totals.
+    """
+    started = time.perf_counter()
+    mode, result = EXTRACTION_MODE, None
+    if mode == "js":
+        try:
+            result = driver.execute_script(script, SELECTORS)
+        except Exception as e:
+            print(f"    -> ⚠️ In-browser extraction failed, parsing page_source instead: {e}")
+    if result is None:
+        mode = "soup"
+        result = soup_parser(parse_html(driver.page_source, scope))
+
+    elapsed = time.perf_counter() - started
+    if timing is not None:
+        timing["seconds"] = timing.get("seconds", 0.0) + elapsed
+        timing["mode"] = mode
+    with _timings_lock:
+        total = _timings.setdefault(mode, [0.0, 0])
+        total[0] += elapsed
+        total[1] += 1
+    return result
+
+def extraction_summary():
+    """One line with the average time per page extraction, per mode."""
+    with _timings_lock:
+        parts = [f"{mode} {seconds / count * 1000:.0f} ms x{count}" for mode, (seconds, count) in _timings.items() if count]
+    return "Extraction time per page view: " + (", ".join(parts) or "n/a")
+
+def soup_header(soup):
+    """BeautifulSoup version of HEADER_SCRIPT."""
+    def text(sel):
+        el = soup.select_one(sel)
+        return el.text.strip() if el else None
+    spans = soup.select(SELECTORS["score_spans"])
+    return {
+        "status": text(SELECTORS["status"]),
+        "home": text(SELECTORS["home_team"]),
+        "away": text(SELECTORS["away_team"]),
+        "score": [spans[0].text.strip(), spans[2].text.strip()] if len(spans) >= 3 else None
+    }
+
+def scrape_basic_info(header):
+    """Team names and Score from the extracted header."""
+    score = header.get("score") or ["0", "0"] # home - away
+    return {
+        "home": header.get("home") or "N/A",
+        "away": header.get("away") or "N/A",
+        "score_home": score[0],
+        "score_away": score[1]
+    }
+
+def soup_stat_rows(soup):
+    """BeautifulSoup version of STATS_SCRIPT: [category, home, away] per statistic row."""
+    rows = []
+    for div in soup.select(SELECTORS["stat_rows"]):
+        category_element = div.select_one(SELECTORS["stat_category"])
+        if not category_element:
+            continue
+        values = div.select(SELECTORS["stat_value"])
+        if len(values) >= 2:
+            rows.append([category_element.text.strip(), values[0].text.strip(), values[1].text.strip()])
+    return rows
+
+def scrape_stats(driver, timing=None):
     """Clicks Statistics tab and extracts various match stats."""
     stats_data = {
         "corners": {"home": "0", "away": "0"},
@@ -60,13 +154,13 @@ def scrape_stats(driver):
                     EC.element_to_be_clickable((By.XPATH, "//button[text()='Statistiche'] | //a[contains(@href, '#match-summary/match-statistics')]"))
                 )
                 driver.execute_script("arguments[0].scrollIntoView(true);", stats_btn)
-                time.sleep(1) # Specific wait to ensure stability after scroll
+                wait_for_dom_quiet(driver, quiet=0.2, name="stats scroll", timeout=1) # Stability after scroll
                 driver.execute_script("arguments[0].click();", stats_btn)
                 clicked = True
             except Exception as e:
                 print(f"    -> Retry {attempts+1} clicking stats: {e}")
                 attempts += 1
-                time.sleep(2)
+                wait_for_dom_quiet(driver, name="stats retry", timeout=2)
         
         if not clicked:
              print("    -> ⚠️ Could not click 'Statistiche' button after retries.")
@@ -78,10 +172,10 @@ def scrape_stats(driver):
             EC.presence_of_element_located((By.CLASS_NAME, "wcl-row_2oCpS"))
         )
         
-        # 3. Parse content
-        soup = BeautifulSoup(driver.page_source, "html.parser")
+        # 3. Extract the statistic rows
+        rows = extract(driver, STATS_SCRIPT, soup_stat_rows, timing, scope="stats")
         
-        # 4. Iterate through rows and map categories
+        # 4. Map categories
         # Mapping Italian label -> internal key
         stat_map = {
             "Calci d'angolo": "corners",
@@ -102,25 +196,10 @@ def scrape_stats(driver):
             "Palle intercettate": "interceptions"
         }
 
-        for div in soup.select('div.wcl-row_2oCpS > div.wcl-category_Ydwqh'):
-            category_element = div.select_one('div.wcl-category_6sT1J')
-            if not category_element:
-                continue
-
-            category_text = category_element.text.strip()
-            
-            # Check if this category is one we want
-            key = None
-            if category_text in stat_map:
-                key = stat_map[category_text]
-            
+        for category_text, home, away in rows:
+            key = stat_map.get(category_text)
             if key:
-                values = div.select('div[data-testid="wcl-statistics-value"]')
-                if len(values) >= 2:
-                    stats_data[key] = {
-                        "home": values[0].text.strip(),
-                        "away": values[1].text.strip()
-                    }
+                stats_data[key] = {"home": home, "away": away}
                 
     except Exception as e:
         print(f"    -> ⚠️ Failed to scrape stats: {e}")
@@ -129,7 +208,40 @@ def scrape_stats(driver):
         
     return stats_data
 
-def scrape_comments(driver):
+def soup_comments(soup):
+    """BeautifulSoup version of COMMENTS_SCRIPT: time, icon type and text per commentary entry."""
+    comments_data = []
+    headline_nodes = soup.select(SELECTORS["comment_headline"])
+    
+    for headline in headline_nodes:
+        row = headline.find_parent('div')
+        if not row:
+            continue
+            
+        # --- A. Extract Time ---
+        time_node = headline.select_one('strong')
+        match_time = time_node.text.strip() if time_node else "N/A"
+
+        # --- B. Extract Icon / Event Type ---
+        icon_node = headline.select_one(SELECTORS["comment_icon"])
+        
+        event_type = "general" # Default if no icon found
+        if icon_node:
+            raw_id = icon_node.get('data-testid', '')
+            event_type = raw_id.replace('wcl-icon-incidents-', '').replace('-', ' ')
+        
+        # --- C. Extract Text ---
+        text_node = row.select_one(SELECTORS["comment_title"])
+        comment_text = text_node.text.strip() if text_node else ""
+
+        comments_data.append({
+            "time": match_time,
+            "type": event_type,
+            "text": comment_text
+        })
+    return comments_data
+
+def scrape_comments(driver, timing=None):
     """Clicks Commento tab and extracts time, icon type, and text."""
     comments_data = []
     # print("    -> Fetching comments...")
@@ -141,7 +253,6 @@ def scrape_comments(driver):
                 EC.element_to_be_clickable((By.XPATH, "//button[text()='Commento'] | //a[contains(@href, '#match-summary/live-commentary')]"))
             )
             driver.execute_script("arguments[0].scrollIntoView(true);", comm_btn)
-            # time.sleep(0.5) 
             driver.execute_script("arguments[0].click();", comm_btn)
         except Exception as e:
             # print(f"    -> ⚠️ Failed to click comment tab: {e}")
@@ -156,54 +267,26 @@ def scrape_comments(driver):
              # print(f"    -> ⚠️ Commentary container not found: {e}")
              return []
         
-        # time.sleep(1) # Removed sleep, wait above is enough
-        
-        # 3. Parse content
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        headline_nodes = soup.select('div[data-testid="wcl-commentary-headline-text"]')
-        
-        for headline in headline_nodes:
-            row = headline.find_parent('div')
-            if not row:
-                continue
-                
-            # --- A. Extract Time ---
-            time_node = headline.select_one('strong')
-            match_time = time_node.text.strip() if time_node else "N/A"
-
-            # --- B. Extract Icon / Event Type ---
-            icon_node = headline.select_one('svg[data-testid^="wcl-icon-incidents-"]')
-            
-            event_type = "general" # Default if no icon found
-            if icon_node:
-                raw_id = icon_node.get('data-testid', '')
-                event_type = raw_id.replace('wcl-icon-incidents-', '').replace('-', ' ')
-            
-            # --- C. Extract Text ---
-            text_node = row.select_one('[data-testid^="wcl-commentaryTitle-"]')
-            comment_text = text_node.text.strip() if text_node else ""
-
-            # Only add if we have text
-            if comment_text:
-                comments_data.append({
-                    "time": match_time,
-                    "type": event_type,
-                    "text": comment_text
-                })
+        # 3. Extract the entries, only those with text
+        comments_data = [c for c in extract(driver, COMMENTS_SCRIPT, soup_comments, timing) if c.get("text")]
 
     except Exception as e:
         print(f"    -> ⚠️ Could not scrape comments: {e}")
     
     return comments_data
 
-def scrape_match_details(driver, product_url, skip_comments=False):
+def scrape_match_details(driver, product_url, skip_comments=False, tab_pool=None):
     print(f"  -> Processing: {product_url}")
     
     final_data = {}
+    timing = {} # Time spent extracting data from the page (not waiting for it)
     
     try:
-        driver.get(product_url)
+        if tab_pool:
+            # Switches to the tab that has been loading this page in the background
+            tab_pool.open(product_url)
+        else:
+            driver.get(product_url)
 
         # 1. Wait for Main Page Load
         WebDriverWait(driver, 20).until(
@@ -216,19 +299,17 @@ def scrape_match_details(driver, product_url, skip_comments=False):
                 EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[id="onetrust-accept-btn-handler"]'))
             )
             cookies.click()
-            # time.sleep(1) # Removed 
         except:
             pass
         # ---------------------------------------
         
-        # 2. Get Basic Info (Teams)
-        initial_soup = BeautifulSoup(driver.page_source, "html.parser")
+        # 2. Get Basic Info (Teams, score, status)
+        header = extract(driver, HEADER_SCRIPT, soup_header, timing, scope="match_header")
         
         # --- SAFEGUARD: CHECK STATUS ---
         # Prevent scraping "Scheduled" or "Postponed" games as 0-0 results
-        status_elem = initial_soup.select_one('div.detailScore__status')
-        if status_elem:
-            status_text = status_elem.text.strip().upper()
+        if header.get("status"):
+            status_text = header["status"].upper()
             # Allow "FINALE", "DOPO RIG.", "DOPO TEMPI SUPPL." etc.
             if "FINALE" not in status_text and "TERMINATO" not in status_text:
                 print(f"  -> ⚠️ Skipping match: Status is '{status_text}' (Not Finished)")
@@ -239,10 +320,10 @@ def scrape_match_details(driver, product_url, skip_comments=False):
              return None
         # -------------------------------
 
-        final_data['squadre'] = scrape_basic_info(initial_soup)
+        final_data['squadre'] = scrape_basic_info(header)
 
         # 3. Get Stats (Corners, Fouls, etc.)
-        final_data['stats'] = scrape_stats(driver)
+        final_data['stats'] = scrape_stats(driver, timing)
         # Flatten for backward compatibility if needed, or keep structured.
         # For now, let's keep 'calci_d_angolo' as a top level key if other parts depend on it,
         # or just use the new structure. The user asked for extraction, so I'll provide the new structure.
@@ -251,12 +332,18 @@ def scrape_match_details(driver, product_url, skip_comments=False):
 
         # 4. Get Comments 
         if not skip_comments:
-            final_data['commenti'] = scrape_comments(driver)
+            final_data['commenti'] = scrape_comments(driver, timing)
         else:
             final_data['commenti'] = []
 
+        record_page(driver, "match") # Bytes and load time, incl. the stats/commentary requests
+
     except Exception as e:
         print(f"  -> ❌ Critical Error on page: {e}")
         return None 
+    finally:
+        if tab_pool:
+            tab_pool.release(product_url)
 
+    print(f"    ⏱️ Extraction: {timing.get('seconds', 0) * 1000:.0f} ms ({timing.get('mode', EXTRACTION_MODE)})")
     return final_data
@@ -0,0 +1,104 @@
+"""
+Network profile of the scraping browser: resources we never read (images, fonts, media, ads and
+trackers) are blocked through the DevTools protocol, and per-page bytes / load time are
+measured from the Performance API so the saving can be shown per page kind.
+
+SCRAPER_BLOCK_RESOURCES=0 turns blocking off (for comparisons). SCRAPER_ALLOW_RESOURCES is a
+comma-separated allow-list of categories (e.g. "images,fonts") or single patterns
+(e.g. "*.svg*", as listed in BLOCK_PROFILE) that stay loaded.
+"""
+import os
+import threading
+
+BLOCK_RESOURCES = os.environ.get("SCRAPER_BLOCK_RESOURCES", "1") != "0"
+ALLOW_RESOURCES = [a.strip() for a in os.environ.get("SCRAPER_ALLOW_RESOURCES", "").split(",") if a.strip()]
+
+# Network.setBlockedURLs wildcard patterns, by category
+BLOCK_PROFILE = {
+    "images": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.ico*", "*.svg*"],
+    "fonts": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*"],
+    "ads": [
+        "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+        "*googletagservices.com*", "*amazon-adsystem.com*", "*adnxs.com*", "*criteo.*", "*taboola.com*",
+        "*outbrain.com*", "*pubmatic.com*", "*rubiconproject.com*", "*casalemedia.com*", "*smartadserver.com*",
+    ],
+    "trackers": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*facebook.net*", "*facebook.com/tr*",
+        "*scorecardresearch.com*", "*hotjar.com*", "*quantserve.com*", "*chartbeat.*", "*newrelic.com*",
+    ],
+}
+
+# Resource timing keeps 250 entries by default, too few for a full match page
+_BUFFER_SCRIPT = "performance.setResourceTimingBufferSize(5000);"
+
+_METRICS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? nav.transferSize : 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+return {
+    bytes: bytes,
+    requests: resources.length + (nav ? 1 : 0),
+    dom_ms: nav ? nav.domContentLoadedEventEnd : null,
+    elapsed_ms: performance.now()
+};
+"""
+
+def blocked_patterns(allow=None):
+    """Patterns of every category, minus the allowed categories and patterns."""
+    allow = ALLOW_RESOURCES if allow is None else allow
+    return [
+        pattern
+        for category, patterns in BLOCK_PROFILE.items() if category not in allow
+        for pattern in patterns if pattern not in allow
+    ]
+
+def chrome_prefs(allow=None):
+    """Content settings for ChromeOptions prefs (images off at the renderer too)."""
+    allow = ALLOW_RESOURCES if allow is None else allow
+    if not BLOCK_RESOURCES or "images" in allow:
+        return {}
+    return {"profile.managed_default_content_settings.images": 2}
+
+def apply_profile(driver):
+    """
+    Applies the profile to the current tab (DevTools settings are per tab, so TabPool calls
+    this for every tab it opens). Failures only disable blocking, never the scrape.
+    """
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _BUFFER_SCRIPT})
+        if BLOCK_RESOURCES:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns()})
+    except Exception as e:
+        print(f"  -> ⚠️ Could not apply the network profile: {e}")
+
+_pages = {} # kind -> [pages, bytes, dom ms]
+_lock = threading.Lock()
+
+def record_page(driver, kind):
+    """
+    Records bytes and DOM-ready time of the page in the current tab under kind ('match', 'results').
+    Cross-origin responses without Timing-Allow-Origin report 0 bytes, so this is a lower bound.
+    """
+    try:
+        metrics = driver.execute_script(_METRICS_SCRIPT)
+    except Exception:
+        return None
+    with _lock:
+        totals = _pages.setdefault(kind, [0, 0, 0.0])
+        totals[0] += 1
+        totals[1] += metrics.get("bytes") or 0
+        totals[2] += metrics.get("dom_ms") or 0
+    return metrics
+
+def page_summary():
+    """Average transferred bytes and DOM-ready time per page kind."""
+    with _lock:
+        lines = [
+            f"  {kind:<8} {pages:>4} pages, {total_bytes / pages / 1024:.0f} KB/page, DOM ready {dom_ms / pages / 1000:.2f}s"
+            for kind, (pages, total_bytes, dom_ms) in sorted(_pages.items()) if pages
+        ]
+    blocking = "on" if BLOCK_RESOURCES else "off"
+    return f"Pages (resource blocking {blocking}):\n" + ("\n".join(lines) or "  none")
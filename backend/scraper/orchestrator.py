@@ -0,0 +1,77 @@
+"""
+Scrapes several leagues in one process, up to --concurrency at a time. The leagues share the
+browsers (DriverPool), one Supabase connection pool and a single existing-URL lookup, so the
+nightly run takes about as long as the slowest league instead of the sum of all of them.
+
+Usage: python -m backend.scraper.orchestrator [league ...] [--concurrency 3] [scraper options]
+"""
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from backend.services.supabase_syncer import fetch_existing_urls
+
+from .config import LEAGUE_URLS
+from .driver import DriverPool
+from .main import add_scrape_arguments, scrape_league
+
+DEFAULT_CONCURRENCY = 3
+
+def run_leagues(leagues, args, concurrency=DEFAULT_CONCURRENCY):
+    """Runs scrape_league for every league; returns {league: {"ok", "matches", "seconds", "error"}}."""
+    existing_urls = set()
+    if not args.skip_sync and not args.force_rescrape:
+        # URLs are unique across leagues: one query instead of one per league
+        existing_urls = fetch_existing_urls()
+
+    driver_pool = DriverPool(max_idle=concurrency * max(1, args.workers), warm=args.warm_browsers)
+    results = {}
+
+    def run(league):
+        started = time.monotonic()
+        try:
+            matches = scrape_league(league, args, existing_urls=existing_urls, driver_pool=driver_pool)
+            return {"ok": True, "matches": matches, "seconds": time.monotonic() - started, "error": None}
+        except Exception as e:
+            print(f"❌ [{league}] Scraper failed: {e}")
+            return {"ok": False, "matches": 0, "seconds": time.monotonic() - started, "error": str(e)}
+
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {executor.submit(run, league): league for league in leagues}
+            for future in as_completed(futures):
+                league = futures[future]
+                results[league] = future.result()
+                status = "✅ Finished" if results[league]["ok"] else "❌ Failed"
+                print(f"{status} {league} in {results[league]['seconds']:.0f}s")
+    finally:
+        driver_pool.close()
+
+    print("\n--- Orchestrator Summary ---")
+    for league in leagues:
+        r = results.get(league, {"ok": False, "matches": 0, "seconds": 0, "error": "not run"})
+        detail = f"{r['matches']} matches" if r["ok"] else f"FAILED: {r['error']}"
+        print(f"  {league:<14} {r['seconds']:>6.0f}s  {detail}")
+    print(f"Total wall-clock time: {time.monotonic() - started:.0f}s")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape several leagues concurrently.")
+    parser.add_argument("leagues", nargs="*", help=f"Leagues to scrape (default: all). Available: {', '.join(LEAGUE_URLS)}")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"Leagues scraped at the same time (default: {DEFAULT_CONCURRENCY})")
+    add_scrape_arguments(parser)
+    args = parser.parse_args()
+
+    unknown = [league for league in args.leagues if league not in LEAGUE_URLS]
+    if unknown:
+        parser.error(f"unknown league(s): {', '.join(unknown)}")
+    results = run_leagues(args.leagues or list(LEAGUE_URLS), args, args.concurrency)
+    failed = [league for league, r in results.items() if not r["ok"]]
+    if failed:
+        print(f"Finished with {len(failed)} failed league(s): {', '.join(failed)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Shared HTML parsing for the scrapers: the fastest installed BeautifulSoup backend, scoped
+parsing of the only subtree a scraper reads, and the site's selectors in one place.
+"""
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml # noqa: F401 (C parser, several times faster than html.parser)
+    DEFAULT_PARSER = "lxml"
+except ImportError:
+    DEFAULT_PARSER = "html.parser"
+
+HTML_PARSER = os.environ.get("SCRAPER_HTML_PARSER", DEFAULT_PARSER)
+
+# Selectors of the pages scraped from diretta.it
+SELECTORS = {
+    # League results list (url_collector)
+    "result_rows": 'div[id="live-table"] div.event__round, div[id="live-table"] div.event__match, div[id="tournamentPage"] div.event__round, div[id="tournamentPage"] div.event__match',
+    "match_link": 'a[class="eventRowLink"]',
+    # Match page header (match_details)
+    "status": 'div.detailScore__status',
+    "home_team": 'div.duelParticipant__home .participant__participantName',
+    "away_team": 'div.duelParticipant__away .participant__participantName',
+    "score_spans": 'div.detailScore__wrapper span',
+    # Match statistics tab
+    "stat_rows": 'div.wcl-row_2oCpS > div.wcl-category_Ydwqh',
+    "stat_category": 'div.wcl-category_6sT1J',
+    "stat_value": 'div[data-testid="wcl-statistics-value"]',
+    # Match commentary tab
+    "comment_headline": 'div[data-testid="wcl-commentary-headline-text"]',
+    "comment_icon": 'svg[data-testid^="wcl-icon-incidents-"]',
+    "comment_title": '[data-testid^="wcl-commentaryTitle-"]',
+    # Standings table (standings / squads)
+    "table_rows": ".ui-table__row",
+    "team_name": ".tableCellParticipant__name",
+    "team_rank": ".tableCellRank",
+    "table_values": ".table__cell--value",
+    "team_logo": ".heading__logo",
+    # Fixtures / results calendar (fixtures_scraper)
+    "calendar_rows": ".sportName > div",
+    "calendar_match_link": "a.eventRowLink",
+}
+
+def has_class(*names):
+    """
+    SoupStrainer matcher for any of these CSS classes. The strainer sees the raw attribute
+    string, and the site pads it ('ui-table__row  '), so a plain class_="..." never matches.
+    """
+    def match(value):
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return any(name in classes for name in names)
+    return match
+
+# Subtrees kept by scoped parsing: everything else of the page is skipped while parsing
+SCOPES = {
+    "live_table": SoupStrainer(id=["live-table", "tournamentPage"]),
+    "match_header": SoupStrainer(class_=has_class("duelParticipant", "detailScore__status")),
+    "stats": SoupStrainer(class_=has_class("wcl-row_2oCpS")),
+    "table_rows": SoupStrainer(class_=has_class("ui-table__row")),
+    "team_logo": SoupStrainer(class_=has_class("heading__logo")),
+    "calendar": SoupStrainer(class_=has_class("sportName")),
+}
+
+def parse_html(html, scope=None, parser=None):
+    """
+    BeautifulSoup of html with the configured parser. With a scope (key of SCOPES) only that
+    subtree is built; selectors relative to it (e.g. SELECTORS) keep working unchanged.
+    """
+    return BeautifulSoup(html, parser or HTML_PARSER, parse_only=SCOPES[scope] if scope else None)
@@ -1,52 +1,100 @@
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from .driver import fully_scroll
+from .parsing import parse_html, SELECTORS
+from .network_profile import record_page
+from .waits import count, wait_for_count, wait_for_dom_quiet, wait_for_network_idle
+
+SHOW_MORE_SELECTORS = [
+    (By.CSS_SELECTOR, "a.event__more"),
+    (By.CSS_SELECTOR, "[data-testid='wcl-buttonLink']"),
+    (By.XPATH, "//a[contains(text(), 'Mostra più incontri')]"),
+    (By.XPATH, "//a[contains(text(), 'Show more matches')]")
+]
+
+# Rounds and match links in page order, read in the browser (no page_source round-trip)
+ROWS_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0].result_rows)).map(function (row) {
+    if (row.classList.contains('event__round')) return ['round', row.textContent.trim()];
+    var link = row.querySelector(arguments[0].match_link);
+    return ['match', link ? link.href : null];
+});
+"""
+
+def click_show_more(driver):
+    """Clicks 'Show more matches' once. Returns False if the button is gone."""
+    # Scroll to bottom to ensure button is in DOM/View (the clickable wait below covers rendering)
+    driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+    for by, val in SHOW_MORE_SELECTORS:
+        try:
+            element = WebDriverWait(driver, 2).until(
+                EC.element_to_be_clickable((by, val))
+            )
+            # If found, click it
+            rows_before = count(driver, SELECTORS["result_rows"])
+            driver.execute_script("arguments[0].scrollIntoView(true);", element)
+            driver.execute_script("arguments[0].click();", element)
+            print(f"    -> Clicked 'Show more matches' (found by {val}). Waiting for load...")
+            # Done as soon as new rows are in and rendering stopped
+            wait_for_count(driver, SELECTORS["result_rows"], at_least=rows_before + 1, name="show more", timeout=10)
+            wait_for_dom_quiet(driver, name="show more settle", timeout=3)
+            return True
+        except:
+            continue
+    return False
 
 def check_more_matches(driver):
     """
     Clicks 'Show more matches' button repeatedly until it's no longer found.
     """
     print("  -> Checking for 'Show more matches' button...")
-    
-    # Selectors to try
-    selectors = [
-        (By.CSS_SELECTOR, "a.event__more"),
-        (By.CSS_SELECTOR, "[data-testid='wcl-buttonLink']"),
-        (By.XPATH, "//a[contains(text(), 'Mostra più incontri')]"),
-        (By.XPATH, "//a[contains(text(), 'Show more matches')]")
-    ]
+    while click_show_more(driver):
+        pass
+    print("  -> All matches loaded (or button not found).")
+
+def loaded_rounds(driver):
+    """[(round name, [match urls])] currently in the DOM, newest round first."""
+    rounds = []
+    for kind, value in driver.execute_script(ROWS_SCRIPT, SELECTORS) or []:
+        if kind == 'round':
+            rounds.append((value, []))
+        elif value and rounds:
+            rounds[-1][1].append(value)
+    return rounds
 
+def first_known_round(rounds, known_urls):
+    """
+    Name of the first round whose matches are all already known, or None. The last loaded
+    round is ignored: it may be cut off at the bottom of the page.
+    """
+    for name, urls in rounds[:-1]:
+        if urls and all(u in known_urls for u in urls):
+            return name
+    return None
+
+def load_new_rounds(driver, known_urls):
+    """
+    Incremental discovery: expands the results list only until a whole round is already
+    known, so routine runs load the new rounds instead of the full season history.
+    """
+    print(f"  -> Incremental discovery ({len(known_urls)} known URLs)...")
     while True:
-        # Scroll to bottom to ensure button is in DOM/View
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)
-        
-        found = False
-        for by, val in selectors:
-            try:
-                element = WebDriverWait(driver, 2).until(
-                    EC.element_to_be_clickable((by, val))
-                )
-                # If found, click it
-                driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                time.sleep(0.5)
-                driver.execute_script("arguments[0].click();", element)
-                print(f"    -> Clicked 'Show more matches' (found by {val}). Waiting for load...")
-                time.sleep(3)
-                found = True
-                break # Break selector loop, restart main loop to check again
-            except:
-                continue
-        
-        if not found:
-            # If we tried all selectors and found nothing, we are done
-            break
-            
-    print("  -> All matches loaded (or button not found).")
+        known_round = first_known_round(loaded_rounds(driver), known_urls)
+        if known_round:
+            print(f"  -> Round '{known_round}' already known. Stopping discovery.")
+            return
+        if not click_show_more(driver):
+            print("  -> All matches loaded (or button not found).")
+            return
 
-def fetch_match_urls(driver, url, last_round_only=False):
+def fetch_match_urls(driver, url, last_round_only=False, known_urls=None):
+    """
+    Rounds and match URLs of a league results page. With known_urls (URLs already in the DB)
+    the page is only expanded until a fully known round appears; the known URLs are still
+    returned for the rounds that were loaded.
+    """
     print(f"Scraping {url}")
     driver.get(url)
 
@@ -59,22 +107,26 @@ def fetch_match_urls(driver, url, last_round_only=False):
     except:
         pass
 
-    # Limit scrolling if we only want the last round
-    scroll_loops = 2 if last_round_only else 7
+    # Limit scrolling if we only want the last round (or only the new ones)
+    scroll_loops = 2 if last_round_only or known_urls else 7
     fully_scroll(driver, pause=1.5, max_loops=scroll_loops)
     
-    if not last_round_only:
-        check_more_matches(driver)
+    if known_urls and not last_round_only:
+        load_new_rounds(driver, known_urls)
+    else:
+        if not last_round_only:
+            check_more_matches(driver)
+        wait_for_network_idle(driver, name="results idle")
+        wait_for_dom_quiet(driver, name="results settle")
 
-    time.sleep(4)
+    record_page(driver, "results")
 
-    soup_html = driver.page_source
-    from bs4 import BeautifulSoup
-    soup = BeautifulSoup(soup_html, "html.parser")
+    # Only the results list is parsed, not the rest of the page
+    soup = parse_html(driver.page_source, scope="live_table")
     results = []
 
     # Select BOTH rounds and matches in order (support both live-table and tournamentPage IDs)
-    all_rows = soup.select('div[id="live-table"] div.event__round, div[id="live-table"] div.event__match, div[id="tournamentPage"] div.event__round, div[id="tournamentPage"] div.event__match')
+    all_rows = soup.select(SELECTORS["result_rows"])
     current_round = "Unknown"
     first_round_found = None
 
@@ -94,7 +146,7 @@ def fetch_match_urls(driver, url, last_round_only=False):
             continue
 
         if 'event__match' in classes:
-            link_tag = row.select_one('a[class="eventRowLink"]')
+            link_tag = row.select_one(SELECTORS["match_link"])
             product_link = link_tag.get('href') if link_tag else None
 
             if product_link:
@@ -0,0 +1,96 @@
+"""
+Event-driven waits for the scrapers: proceed as soon as the page is ready instead of sleeping
+for the worst case. Every wait has a name; its timeout adapts to how long that wait took on
+recent pages, and each actual duration is recorded for wait_summary().
+"""
+import time
+import threading
+from collections import deque
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+POLL_SECONDS = 0.1
+HISTORY = 30          # Recent durations kept per wait name
+TIMEOUT_FACTOR = 3.0  # Adaptive timeout = factor x the slowest recent duration (within min/max)
+
+# Counts DOM mutations into window.__lastMutation (installed once per document)
+_OBSERVER_SCRIPT = """
+if (!window.__mutationObserver) {
+    window.__lastMutation = performance.now();
+    window.__mutationObserver = new MutationObserver(function () { window.__lastMutation = performance.now(); });
+    window.__mutationObserver.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return performance.now() - window.__lastMutation;
+"""
+
+# Resource timing entries so far and the time since the last one finished
+_NETWORK_SCRIPT = """
+var entries = performance.getEntriesByType('resource');
+var last = 0;
+for (var i = 0; i < entries.length; i++) { last = Math.max(last, entries[i].responseEnd); }
+return [document.readyState, entries.length, performance.now() - last];
+"""
+
+_COUNT_SCRIPT = "return document.querySelectorAll(arguments[0]).length;"
+
+_history = {} # name -> deque of seconds
+_stats = {}   # name -> [waits, timeouts, total seconds]
+_lock = threading.Lock()
+
+def adaptive_timeout(name, default, minimum=1.0):
+    """default until the wait has history, then TIMEOUT_FACTOR x its slowest recent duration."""
+    with _lock:
+        recent = _history.get(name)
+        if not recent:
+            return default
+        return min(default, max(minimum, max(recent) * TIMEOUT_FACTOR))
+
+def record(name, seconds, ok):
+    with _lock:
+        _history.setdefault(name, deque(maxlen=HISTORY)).append(seconds)
+        stats = _stats.setdefault(name, [0, 0, 0.0])
+        stats[0] += 1
+        stats[1] += 0 if ok else 1
+        stats[2] += seconds
+
+def wait_summary():
+    """One line per wait name: count, average duration, timeouts."""
+    with _lock:
+        lines = [
+            f"  {name:<18} {waits:>4} waits, avg {total / waits:.2f}s, {timeouts} timeouts"
+            for name, (waits, timeouts, total) in sorted(_stats.items()) if waits
+        ]
+    return "Waits:\n" + ("\n".join(lines) or "  none")
+
+def wait_until(driver, name, condition, timeout=10, minimum=1.0):
+    """
+    Polls condition(driver) until truthy. Returns its value, or False on timeout (callers
+    carry on with what is on the page, as after the old fixed sleeps).
+    """
+    limit = adaptive_timeout(name, timeout, minimum)
+    started = time.monotonic()
+    try:
+        result = WebDriverWait(driver, limit, poll_frequency=POLL_SECONDS).until(condition)
+        ok = True
+    except Exception:
+        result, ok = False, False
+    record(name, time.monotonic() - started, ok)
+    return result
+
+def count(driver, css):
+    return driver.execute_script(_COUNT_SCRIPT, css)
+
+def wait_for_count(driver, css, at_least=1, name=None, timeout=10):
+    """Until at least `at_least` elements match css (e.g. rows of a table, or more rows than before)."""
+    return wait_until(driver, name or f"count {css}", lambda d: count(d, css) >= at_least, timeout)
+
+def wait_for_dom_quiet(driver, quiet=0.3, name="dom quiet", timeout=5):
+    """Until the DOM has not changed for `quiet` seconds (rendering after a click or a scroll is over)."""
+    return wait_until(driver, name, lambda d: d.execute_script(_OBSERVER_SCRIPT) >= quiet * 1000, timeout, minimum=quiet * 2)
+
+def wait_for_network_idle(driver, idle=0.5, name="network idle", timeout=15):
+    """Until the document is loaded and no resource has finished for `idle` seconds."""
+    def idle_now(d):
+        state, _, since_last = d.execute_script(_NETWORK_SCRIPT)
+        return state != "loading" and since_last >= idle * 1000
+    return wait_until(driver, name, idle_now, timeout, minimum=idle * 2)
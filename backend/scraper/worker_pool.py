@@ -0,0 +1,185 @@
+import time
+import queue
+import threading
+from collections import deque
+
+from .driver import make_driver, TabPool, driver_alive, quit_driver
+from .match_details import scrape_match_details, extraction_summary
+from .waits import wait_summary
+from .network_profile import page_summary
+
+MAX_DRIVER_FAILURES = 3 # Consecutive failed (re)starts before a worker gives up
+
+class ScrapeWorkerPool:
+    """
+    N independent browsers pulling match URLs from a shared queue. Each worker restarts its
+    browser every 'restart_every' matches (memory) and after a crash (retrying that match once).
+    scrape() yields results in input order, so batching/syncing behaves like a sequential run.
+    With tabs > 1 each browser keeps the next matches loading in background tabs. With a
+    driver_pool, browsers come from and go back to that shared pool.
+    """
+    def __init__(self, workers=1, skip_comments=False, restart_every=30, first_driver=None, tabs=1, driver_pool=None):
+        self.workers = max(1, workers)
+        self.tabs = max(1, tabs)
+        self.driver_pool = driver_pool
+        self.skip_comments = skip_comments
+        self.restart_every = restart_every
+        self.first_driver = first_driver # Reused by worker 0 instead of starting a new browser
+        self.completed = 0
+        self.started_at = None
+        self._lock = threading.Lock()
+
+    def _new_driver(self, worker_id):
+        for attempt in range(MAX_DRIVER_FAILURES):
+            try:
+                return self.driver_pool.acquire() if self.driver_pool else make_driver()
+            except Exception as e:
+                print(f"    [W{worker_id}] ⚠️ Could not start browser (attempt {attempt + 1}): {e}")
+                time.sleep(2 * (attempt + 1))
+        return None
+
+    def _done_with(self, driver, tab_pool=None, retire=False):
+        """
+        Hands a browser back to the shared pool (with a single tab) or quits it. A retired browser
+        (periodic restart) is always quit: back in the pool it would be handed out again.
+        """
+        if self.driver_pool and not retire:
+            if tab_pool:
+                try:
+                    tab_pool.close()
+                except Exception:
+                    pass
+            self.driver_pool.release(driver)
+        else:
+            quit_driver(driver)
+
+    def _tab_pool(self, driver, worker_id):
+        if driver is None or self.tabs == 1:
+            return None
+        try:
+            return TabPool(driver, self.tabs)
+        except Exception as e:
+            print(f"    [W{worker_id}] ⚠️ Could not open tabs, loading one page at a time: {e}")
+            return None
+
+    def _worker(self, worker_id, jobs, results):
+        driver = self.first_driver if worker_id == 0 and self.first_driver else self._new_driver(worker_id)
+        tab_pool = self._tab_pool(driver, worker_id)
+        window = deque() # Jobs taken from the queue, already loading in a tab when tab_pool is set
+        current = None   # Index of the job being scraped
+        exhausted = False
+        scraped = 0
+        try:
+            while True:
+                while not exhausted and len(window) < self.tabs:
+                    job = jobs.get()
+                    if job is None:
+                        exhausted = True
+                        break
+                    window.append(job)
+                    if tab_pool:
+                        try:
+                            tab_pool.prefetch(job[1]['url'])
+                        except Exception:
+                            pass # Loaded in the foreground by open() instead
+                if not window:
+                    return
+                index, game = window.popleft()
+                current = index
+
+                if driver is not None and self.restart_every and scraped and scraped % self.restart_every == 0:
+                    print(f"    [W{worker_id}] Restarting browser to free resources...")
+                    self._done_with(driver, tab_pool, retire=True)
+                    driver = self._new_driver(worker_id)
+                    tab_pool = self._tab_pool(driver, worker_id)
+
+                details = None
+                for attempt in range(2):
+                    if driver is None:
+                        break
+                    details = scrape_match_details(driver, game['url'], skip_comments=self.skip_comments, tab_pool=tab_pool)
+                    if details is not None or driver_alive(driver):
+                        break
+                    print(f"    [W{worker_id}] Browser died, restarting and retrying {game['url']}")
+                    quit_driver(driver)
+                    driver = self._new_driver(worker_id)
+                    tab_pool = self._tab_pool(driver, worker_id)
+
+                scraped += 1
+                results.put((index, details))
+                current = None
+                self._report()
+
+                if driver is None:
+                    print(f"    [W{worker_id}] ❌ No working browser, worker stopped.")
+                    return
+        except Exception as e:
+            print(f"    [W{worker_id}] ❌ Worker crashed: {e}")
+        finally:
+            # Jobs taken from the queue are reported as failed, nobody else will scrape them
+            # (scrape() waits for every index)
+            if current is not None:
+                results.put((current, None))
+            for index, _ in window:
+                results.put((index, None))
+            if driver is not None:
+                self._done_with(driver, tab_pool)
+
+    def _report(self):
+        with self._lock:
+            self.completed += 1
+            if self.completed % 10 == 0:
+                print(f"  ⏱️ {self.completed} matches scraped, {self.matches_per_minute():.1f} matches/min")
+
+    def matches_per_minute(self):
+        elapsed = time.monotonic() - self.started_at
+        return self.completed / elapsed * 60 if elapsed > 0 else 0.0
+
+    def scrape(self, games):
+        """Yields (game, details) for every game, in input order (details is None on failure)."""
+        if not games:
+            if self.first_driver:
+                self._done_with(self.first_driver)
+            return
+
+        jobs, results = queue.Queue(), queue.Queue()
+        for index, game in enumerate(games):
+            jobs.put((index, game))
+        n_workers = min(self.workers, len(games))
+        for _ in range(n_workers):
+            jobs.put(None)
+
+        self.started_at = time.monotonic()
+        threads = [
+            threading.Thread(target=self._worker, args=(worker_id, jobs, results), daemon=True)
+            for worker_id in range(n_workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        pending = {}
+        next_index = 0
+        while next_index < len(games):
+            try:
+                index, details = results.get(timeout=1)
+                pending[index] = details
+            except queue.Empty:
+                if not any(t.is_alive() for t in threads) and results.empty():
+                    # Every worker lost its browser: report the remaining matches as failed
+                    while True:
+                        try:
+                            job = jobs.get_nowait()
+                        except queue.Empty:
+                            break
+                        if job is not None:
+                            pending[job[0]] = None
+            while next_index in pending:
+                yield games[next_index], pending.pop(next_index)
+                next_index += 1
+
+        for thread in threads:
+            thread.join()
+        print(f"  ⏱️ Scraped {self.completed} matches with {n_workers} worker(s): {self.matches_per_minute():.1f} matches/min")
+        print(f"  ⏱️ {extraction_summary()}")
+        print(wait_summary())
+        print(page_summary())
@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 import datetime
 
 # Add project root to path
@@ -9,14 +8,14 @@ project_root = os.path.dirname(os.path.dirname(current_dir))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from backend.scraper.driver import make_driver
-import time
-import datetime
+from backend.scraper.driver import DriverPool
+from backend.scraper.parsing import parse_html, SELECTORS
+from backend.scraper.waits import count, wait_for_count, wait_for_dom_quiet, wait_for_network_idle, wait_summary
+from backend.services.data_cache import bump_data_version
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
@@ -65,7 +64,7 @@ def scrape_league(driver, supabase, league_name, url, scrape_type="fixtures"):
     print(f"Connecting to {url} ({scrape_type})...")
     driver.get(url)
     print("  -> Page loaded, waiting for content...")
-    time.sleep(5) # Extra wait for initial load
+    wait_for_network_idle(driver, name="fixtures load")
     
     try:
         # Wait for the main table to load
@@ -81,7 +80,7 @@ def scrape_league(driver, supabase, league_name, url, scrape_type="fixtures"):
                 EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
             )
             accept_btn.click()
-            time.sleep(2)
+            wait_for_dom_quiet(driver, name="cookie banner", timeout=2)
         except:
             print("  -> Cookie banner not found or already accepted.")
 
@@ -92,7 +91,7 @@ def scrape_league(driver, supabase, league_name, url, scrape_type="fixtures"):
             try:
                 # Scroll to bottom to ensure button is viewable/trigger lazy load
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1)
+                wait_for_dom_quiet(driver, quiet=0.2, name="fixtures scroll", timeout=1)
                 
                 # Try multiple selectors based on user feedback and common patterns
                 more_btns = []
@@ -112,9 +111,12 @@ def scrape_league(driver, supabase, league_name, url, scrape_type="fixtures"):
                 if more_btns:
                     more_btn = more_btns[0]
                     if more_btn.is_displayed():
+                        rows_before = count(driver, SELECTORS["calendar_rows"])
                         driver.execute_script("arguments[0].click();", more_btn)
                         print("  -> Clicked 'Show more matches'")
-                        time.sleep(3) # Wait for content to load
+                        # Wait for content to load: new rows, then rendering done
+                        wait_for_count(driver, SELECTORS["calendar_rows"], at_least=rows_before + 1, name="fixtures more", timeout=10)
+                        wait_for_dom_quiet(driver, name="fixtures more settle", timeout=3)
                         retries = 0 # Reset retries
                     else:
                         print("  -> 'Show more' button found but not displayed.")
@@ -125,18 +127,18 @@ def scrape_league(driver, supabase, league_name, url, scrape_type="fixtures"):
                         print("  -> No 'Show more' button found after retries. Assuming all loaded.")
                         break
                     print(f"  -> 'Show more' button not found, retrying ({retries}/{max_retries})...")
-                    time.sleep(2)
+                    wait_for_dom_quiet(driver, name="fixtures retry", timeout=2)
             except Exception as e:
                 print(f"  -> Error in 'Show more' loop: {e}")
                 break
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = parse_html(driver.page_source, scope="calendar")
         
         fixtures = []
         current_round = 0
         
         # Select all rows in the sportName container
-        rows = soup.select(".sportName > div")
+        rows = soup.select(SELECTORS["calendar_rows"])
         
         for row in rows:
             classes = row.get("class", [])
@@ -151,7 +153,7 @@ def scrape_league(driver, supabase, league_name, url, scrape_type="fixtures"):
                 print(f"Found Round: {current_round}")
                 
             # 2. Check for Match Row (must contain eventRowLink)
-            elif row.select_one("a.eventRowLink"):
+            elif row.select_one(SELECTORS["calendar_match_link"]):
                 try:
                     # Extract text with separator to handle text nodes
                     # Expected format: "29.11. 20:00|Home Team|-|Away Team|..."
@@ -385,6 +387,9 @@ def scrape_league(driver, supabase, league_name, url, scrape_type="fixtures"):
                         print(f"  -> Error inserting matches: {insert_e}")
                 
                 print(f"  -> Updated {updates_count} existing matches.")
+
+                if to_insert or updates_count:
+                    bump_data_version("fixtures")
                 print(f"  -> No changes for {len(fixtures) - len(to_insert) - updates_count} matches.")
 
             except Exception as e:
@@ -454,28 +459,36 @@ def scrape_fixtures():
             print(f"League '{args.league}' not found. Available: {[l['key'] for l in leagues]}")
             return
 
-    for league in target_leagues:
-        print(f"\n--- Scraping {league['name']} ---")
-        driver = make_driver()
-        if not driver:
-             print("Failed to initialize driver. Skipping.")
-             continue
+    # One browser for every league (Chrome version and patched driver are cached by make_driver)
+    driver_pool = DriverPool(max_idle=1)
+    try:
+        for league in target_leagues:
+            print(f"\n--- Scraping {league['name']} ---")
+            try:
+                driver = driver_pool.acquire()
+            except Exception as e:
+                print(f"Failed to initialize driver ({e}). Skipping.")
+                continue
 
-        # 1. Scrape Results (History)
-        try:
-             results_url = league['base_url'] + "risultati/"
-             scrape_league(driver, supabase, league['name'], results_url, scrape_type="results")
-        except Exception as e:
-             print(f"Error scraping RESULTS for {league['name']}: {e}")
+            # 1. Scrape Results (History)
+            try:
+                 results_url = league['base_url'] + "risultati/"
+                 scrape_league(driver, supabase, league['name'], results_url, scrape_type="results")
+            except Exception as e:
+                 print(f"Error scraping RESULTS for {league['name']}: {e}")
 
-        # 2. Scrape Fixtures (Future)
-        try:
-             fixtures_url = league['base_url'] + "calendario/"
-             scrape_league(driver, supabase, league['name'], fixtures_url, scrape_type="fixtures")
-        except Exception as e:
-             print(f"Error scraping FIXTURES for {league['name']}: {e}")
+            # 2. Scrape Fixtures (Future)
+            try:
+                 fixtures_url = league['base_url'] + "calendario/"
+                 scrape_league(driver, supabase, league['name'], fixtures_url, scrape_type="fixtures")
+            except Exception as e:
+                 print(f"Error scraping FIXTURES for {league['name']}: {e}")
+
+            driver_pool.release(driver)
+    finally:
+        driver_pool.close()
 
-        driver.quit()
+    print(wait_summary())
                 
     # Check next fixtures
     get_next_fixtures(supabase)
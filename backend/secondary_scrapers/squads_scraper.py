@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 
 # Add project root to path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,10 +10,12 @@ if project_root not in sys.path:
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 from supabase import create_client, Client
 from dotenv import load_dotenv
-from backend.scraper.driver import make_driver
+from backend.scraper.driver import make_driver, quit_driver, DriverPool
+from backend.scraper.parsing import parse_html, SELECTORS
+from backend.scraper.waits import wait_for_count, wait_for_dom_quiet, wait_summary
+from backend.services.data_cache import bump_data_version
 
 # Load environment variables
 load_dotenv()
@@ -34,13 +35,17 @@ def setup_supabase_client():
         print(f"Error initializing Supabase client: {e}")
         return None
 
-def scrape_squads(league_name, url):
+def scrape_squads(league_name, url, driver_pool=None):
+    """With a driver_pool the browser is reused by the next league instead of being quit."""
     print(f"--- Scraping Squads (Teams) for {league_name} ---")
-    driver = make_driver()
+    driver = driver_pool.acquire() if driver_pool else make_driver()
     supabase = setup_supabase_client()
     
     if not supabase:
-        driver.quit()
+        if driver_pool:
+            driver_pool.release(driver)
+        else:
+            quit_driver(driver)
         return
 
     try:
@@ -59,7 +64,7 @@ def scrape_squads(league_name, url):
                 EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
             )
             accept_btn.click()
-            time.sleep(1)
+            wait_for_dom_quiet(driver, name="cookie banner", timeout=1)
         except:
             pass
 
@@ -71,14 +76,14 @@ def scrape_squads(league_name, url):
             f.write(driver.page_source)
         print("  -> DEBUG: Saved page source to debug_squads.html")
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = parse_html(driver.page_source, scope="table_rows")
         
         # Find team links
         # .tableCellParticipant__name > a
         team_links = []
-        rows = soup.select(".ui-table__row")
+        rows = soup.select(SELECTORS["table_rows"])
         for row in rows:
-            link_elem = row.select_one(".tableCellParticipant__name")
+            link_elem = row.select_one(SELECTORS["team_name"])
             if link_elem:
                 team_name = link_elem.get_text(strip=True)
                 href = link_elem.get("href")
@@ -88,23 +93,19 @@ def scrape_squads(league_name, url):
         
         print(f"  -> Found {len(team_links)} teams.")
         
+        synced_count = 0
         for team in team_links:
             print(f"  -> Processing {team['name']}...")
             try:
                 driver.get(team['url'])
-                time.sleep(2) # Wait for load
                 
-                # Wait for logo
+                # Wait for logo (as long as it takes, not a fixed delay first)
                 # Selector for logo: .heading__logo
-                try:
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".heading__logo"))
-                    )
-                except:
+                if not wait_for_count(driver, SELECTORS["team_logo"], name="team logo", timeout=10):
                     print("    -> Logo not found, skipping wait.")
                 
-                team_soup = BeautifulSoup(driver.page_source, 'html.parser')
-                logo_elem = team_soup.select_one(".heading__logo")
+                team_soup = parse_html(driver.page_source, scope="team_logo")
+                logo_elem = team_soup.select_one(SELECTORS["team_logo"])
                 logo_url = logo_elem.get("src") if logo_elem else None
                 
                 if logo_url:
@@ -125,16 +126,23 @@ def scrape_squads(league_name, url):
                     else:
                         supabase.table("squads").insert(data).execute()
                         print(f"    -> Inserted {team['name']}")
+                    synced_count += 1
                 else:
                     print(f"    -> No logo found for {team['name']}")
                     
             except Exception as e:
                 print(f"    -> Error processing {team['name']}: {e}")
+
+        if synced_count:
+            bump_data_version("squads")
                 
     except Exception as e:
         print(f"Error scraping squads: {e}")
     finally:
-        driver.quit()
+        if driver_pool:
+            driver_pool.release(driver)
+        else:
+            quit_driver(driver)
 
 import argparse
 
@@ -162,8 +170,14 @@ def main():
             print(f"League '{args.league}' not found. Available: {[l['key'] for l in leagues]}")
             return
     
-    for league in target_leagues:
-        scrape_squads(league["name"], league["url"])
+    # One browser for every league (Chrome version and patched driver are cached by make_driver)
+    driver_pool = DriverPool(max_idle=1)
+    try:
+        for league in target_leagues:
+            scrape_squads(league["name"], league["url"], driver_pool=driver_pool)
+    finally:
+        driver_pool.close()
+    print(wait_summary())
 
 if __name__ == "__main__":
     main()
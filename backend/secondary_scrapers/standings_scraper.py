@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 import datetime
 
 # Add project root to path
@@ -12,10 +11,12 @@ if project_root not in sys.path:
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 from supabase import create_client, Client
 from dotenv import load_dotenv
-from backend.scraper.driver import make_driver
+from backend.scraper.driver import make_driver, quit_driver, DriverPool
+from backend.scraper.parsing import parse_html, SELECTORS
+from backend.scraper.waits import wait_for_dom_quiet, wait_summary
+from backend.services.data_cache import bump_data_version
 
 # Load environment variables
 load_dotenv()
@@ -35,13 +36,17 @@ def setup_supabase_client():
         print(f"Error initializing Supabase client: {e}")
         return None
 
-def scrape_standings(league_name, url):
+def scrape_standings(league_name, url, driver_pool=None):
+    """With a driver_pool the browser is reused by the next league instead of being quit."""
     print(f"--- Scraping Standings for {league_name} ---")
-    driver = make_driver()
+    driver = driver_pool.acquire() if driver_pool else make_driver()
     supabase = setup_supabase_client()
     
     if not supabase:
-        driver.quit()
+        if driver_pool:
+            driver_pool.release(driver)
+        else:
+            quit_driver(driver)
         return
 
     try:
@@ -59,13 +64,13 @@ def scrape_standings(league_name, url):
                 EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
             )
             accept_btn.click()
-            time.sleep(1)
+            wait_for_dom_quiet(driver, name="cookie banner", timeout=1)
         except:
             pass
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = parse_html(driver.page_source, scope="table_rows")
         
-        rows = soup.select(".ui-table__row")
+        rows = soup.select(SELECTORS["table_rows"])
         print(f"  -> Found {len(rows)} rows.")
         
         standings_data = []
@@ -84,8 +89,8 @@ def scrape_standings(league_name, url):
                 # Expected cells: Rank, Team, Played, Won, Drawn, Lost, Goals (For:Against), Points, Form
                 # But Diretta classes are specific.
                 
-                rank = row.select_one(".tableCellRank").get_text(strip=True).replace(".", "")
-                team_name = row.select_one(".tableCellParticipant__name").get_text(strip=True)
+                rank = row.select_one(SELECTORS["team_rank"]).get_text(strip=True).replace(".", "")
+                team_name = row.select_one(SELECTORS["team_name"]).get_text(strip=True)
                 
                 # Points is usually in a cell with specific class or just by index
                 # Let's iterate cells to find data
@@ -105,7 +110,7 @@ def scrape_standings(league_name, url):
                 
                 # Select all value cells (Played, Won, Drawn, Lost, Goals, Diff, Points)
                 # The class is usually 'table__cell table__cell--value'
-                value_cells = [c.get_text(strip=True) for c in row.select(".table__cell--value")]
+                value_cells = [c.get_text(strip=True) for c in row.select(SELECTORS["table_values"])]
                 
                 # Expected columns based on HTML:
                 # 0: Played (e.g. 14)
@@ -176,12 +181,16 @@ def scrape_standings(league_name, url):
                 except Exception as e:
                     print(f"    -> Error syncing {item['team']}: {e}")
             
+            bump_data_version("standings")
             print("  -> Sync complete.")
 
     except Exception as e:
         print(f"Error scraping standings: {e}")
     finally:
-        driver.quit()
+        if driver_pool:
+            driver_pool.release(driver)
+        else:
+            quit_driver(driver)
 
 import argparse
 
@@ -207,8 +216,14 @@ def main():
             print(f"League '{args.league}' not found. Available: {[l['key'] for l in leagues]}")
             return
 
-    for league in target_leagues:
-        scrape_standings(league["name"], league["url"])
+    # One browser for every league (Chrome version and patched driver are cached by make_driver)
+    driver_pool = DriverPool(max_idle=1)
+    try:
+        for league in target_leagues:
+            scrape_standings(league["name"], league["url"], driver_pool=driver_pool)
+    finally:
+        driver_pool.close()
+    print(wait_summary())
 
 if __name__ == "__main__":
     main()
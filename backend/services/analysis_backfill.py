@@ -0,0 +1,175 @@
+"""
+Fills summary_match / detail_* for matches scraped with --skip-analysis, using the commentary
+stored at scrape time (match_commentary table) instead of a new browser session.
+
+Matches of teams playing in the next days go first, then the most recent rounds. Runs within a
+daily analysis quota and is resumable: finished matches drop out of the query, the quota used
+today and repeated failures are kept in a small state file.
+
+Usage: python -m backend.services.analysis_backfill [--max-analyses 200] [--league "Serie A"] [--dry-run]
+"""
+import os
+import json
+import argparse
+from datetime import datetime, timedelta, date
+from urllib.parse import quote
+from concurrent.futures import as_completed
+
+import requests
+from dotenv import load_dotenv
+
+from backend.services.data_cache import bump_data_version
+from backend.services.table_reader import fetch_table, build_filters
+from backend.services.supabase_syncer import build_stats_payload, COMMENTARY_TABLE
+from backend.services.gemini_analyzer import submit_analysis
+from backend.services.analyzer_backends import get_backend
+
+BACKFILL_DAILY_LIMIT = int(os.environ.get("BACKFILL_DAILY_LIMIT", 200))
+BACKFILL_UPCOMING_DAYS = int(os.environ.get("BACKFILL_UPCOMING_DAYS", 7))
+MAX_FAILURES = 3 # A match failing this many times is skipped by later runs (delete the state file to retry)
+STATE_PATH = os.environ.get(
+    "BACKFILL_STATE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "backfill_state.json")
+)
+URL_CHUNK = 50 # URLs per 'in.(...)' filter, keeps the query string short
+
+def load_state():
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (FileNotFoundError, ValueError):
+        state = {}
+    if state.get("date") != date.today().isoformat():
+        state["date"], state["used"] = date.today().isoformat(), 0 # New day, new quota
+    state.setdefault("failures", {})
+    return state
+
+def save_state(state):
+    os.makedirs(os.path.dirname(os.path.abspath(STATE_PATH)), exist_ok=True)
+    with open(STATE_PATH, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+def url_in_filter(urls):
+    values = ",".join('"' + u.replace('"', '\\"') + '"' for u in urls)
+    return f"&url=in.({quote(values, safe=',')})"
+
+def fetch_candidates(base_url, headers, league=None):
+    """Matches without analysis (and with a URL, the key of the stored commentary)."""
+    filters = build_filters(league=league) + "&summary_match=is.null&url=not.is.null"
+    return fetch_table(base_url, "matches", headers, select="id,url,league,home_team,away_team,giornata", filters=filters)
+
+def fetch_commentary(base_url, headers, urls):
+    """{url: commentary row} for the URLs that have stored commentary."""
+    stored = {}
+    urls = list(urls)
+    for start in range(0, len(urls), URL_CHUNK):
+        rows = fetch_table(
+            base_url, COMMENTARY_TABLE, headers,
+            select="url,comments,stats,teams", filters=url_in_filter(urls[start:start + URL_CHUNK])
+        )
+        stored.update({row["url"]: row for row in rows if row.get("comments")})
+    return stored
+
+def fetch_upcoming_teams(base_url, headers):
+    """Teams with a scheduled fixture in the next BACKFILL_UPCOMING_DAYS days."""
+    now = datetime.now()
+    filters = (
+        f"&status=eq.SCHEDULED&match_date=gte.{now.date().isoformat()}"
+        f"&match_date=lte.{(now + timedelta(days=BACKFILL_UPCOMING_DAYS)).date().isoformat()}"
+    )
+    try:
+        fixtures = fetch_table(base_url, "fixtures", headers, select="id,home_team,away_team", filters=filters)
+    except Exception as e:
+        print(f"⚠️ Could not load upcoming fixtures, using recency only: {e}")
+        return set()
+    return {f["home_team"] for f in fixtures} | {f["away_team"] for f in fixtures}
+
+def prioritise(candidates, upcoming_teams):
+    """Upcoming opponents' matches first, most recent round first within each group."""
+    def priority(match):
+        involved = match.get("home_team") in upcoming_teams or match.get("away_team") in upcoming_teams
+        return (0 if involved else 1, -(match.get("giornata") or 0), match.get("id") or 0)
+    return sorted(candidates, key=priority)
+
+def save_analysis(base_url, headers, match_id, analysis):
+    payload = build_stats_payload({"gemini_analysis": analysis})
+    resp = requests.patch(f"{base_url}/rest/v1/matches?id=eq.{match_id}", json=payload, headers=headers)
+    resp.raise_for_status()
+
+def run_backfill(max_analyses=BACKFILL_DAILY_LIMIT, league=None, dry_run=False):
+    load_dotenv()
+    base_url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY")
+    if not base_url or not key:
+        print("❌ Error: Missing SUPABASE_URL or SUPABASE_KEY in .env")
+        return
+
+    headers = {
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json",
+        "Prefer": "return=minimal"
+    }
+
+    state = load_state()
+    remaining = max_analyses - state["used"]
+    if remaining <= 0:
+        print(f"⏸️ Daily analysis quota reached ({state['used']}/{max_analyses}), resume tomorrow.")
+        return
+
+    candidates = fetch_candidates(base_url, headers, league)
+    stored = fetch_commentary(base_url, headers, [m["url"] for m in candidates])
+    candidates = [
+        m for m in candidates
+        if m["url"] in stored and state["failures"].get(m["url"], 0) < MAX_FAILURES
+    ]
+    queue = prioritise(candidates, fetch_upcoming_teams(base_url, headers))[:remaining]
+    print(f"🗂️ {len(candidates)} matches with stored commentary need analysis, running {len(queue)} (quota left today: {remaining})")
+
+    if dry_run:
+        for m in queue:
+            print(f"  - {m.get('league')}: {m.get('home_team')} vs {m.get('away_team')} (Giornata {m.get('giornata')})")
+        return
+    if queue and not get_backend().available():
+        return # Without a key every analysis would fail and be counted against the matches
+
+    # Concurrency and RPM/TPM pacing come from the shared Gemini scheduler
+    futures = {}
+    for match in queue:
+        row = stored[match["url"]]
+        futures[submit_analysis(row["comments"], row.get("stats"), row.get("teams"))] = match
+
+    done = failed = 0
+    for future in as_completed(futures):
+        match = futures[future]
+        label = f"{match.get('home_team')} vs {match.get('away_team')}"
+        state["used"] += 1
+        analysis = future.result()
+        try:
+            if "error" in analysis:
+                raise RuntimeError(analysis["error"])
+            save_analysis(base_url, headers, match["id"], analysis)
+            state["failures"].pop(match["url"], None)
+            done += 1
+            print(f"✅ Analysed: {label}")
+        except Exception as e:
+            state["failures"][match["url"]] = state["failures"].get(match["url"], 0) + 1
+            failed += 1
+            print(f"❌ Analysis failed for {label}: {e}")
+        save_state(state) # After every match, so an interrupted run resumes with the right quota
+
+    print(f"\n--- Backfill Complete ---\nAnalysed: {done}\nFailed: {failed}\nQuota used today: {state['used']}/{max_analyses}")
+    if done:
+        bump_data_version("matches")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Gemini analyses for matches scraped without them.")
+    parser.add_argument("--max-analyses", type=int, default=BACKFILL_DAILY_LIMIT, help="Daily analysis quota (shared by all runs of the day)")
+    parser.add_argument("--league", default=None, help="Only this league (DB name, e.g. 'Serie A')")
+    parser.add_argument("--dry-run", action="store_true", help="Only print what would be analysed")
+    args = parser.parse_args()
+
+    run_backfill(args.max_analyses, args.league, args.dry_run)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+
+import orjson
+
+# SQLite file shared by the API and the scrapers (same machine). Entries are immutable,
+# only their last-use time changes, so concurrent writers cannot corrupt a result.
+CACHE_PATH = os.environ.get(
+    "ANALYSIS_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "cache", "analyses.sqlite")
+)
+CACHE_MAX_BYTES = int(float(os.environ.get("ANALYSIS_CACHE_MAX_MB", 50)) * 1024 * 1024)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+def _normalise(text):
+    return _WHITESPACE_RE.sub(" ", str(text or "")).strip()
+
+def analysis_key(comments, stats_data, teams, prompt, model_name):
+    """
+    Content address of an analysis: same commentary (whitespace-insensitive), stats, teams,
+    prompt template and model give the same key. Editing the prompt changes every key.
+    """
+    payload = {
+        "comments": [
+            [_normalise(c.get("time")), _normalise(c.get("type")), _normalise(c.get("text"))]
+            for c in comments or []
+        ],
+        "stats": stats_data or {},
+        "teams": teams or {},
+        "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        "model": model_name
+    }
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+class AnalysisCache:
+    """Persistent content-addressed store of successful analyses, evicted LRU by total size."""
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "key TEXT PRIMARY KEY, model TEXT, result BLOB NOT NULL, "
+                "size INTEGER NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used)")
+        return self._conn
+
+    def get(self, key):
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute("SELECT result FROM analyses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                with conn:
+                    conn.execute("UPDATE analyses SET last_used = ? WHERE key = ?", (time.time(), key))
+            return orjson.loads(row[0])
+        except Exception as e:
+            print(f"⚠️ Analysis cache read failed: {e}")
+            return None
+
+    def put(self, key, result, model_name=None):
+        """Stores a successful analysis. Error results must not be cached (they are retryable)."""
+        if not isinstance(result, dict) or "error" in result:
+            return
+        blob = orjson.dumps(result)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO analyses (key, model, result, size, created_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, model_name, blob, len(blob), now, now)
+                    )
+                    self._evict(conn)
+        except Exception as e:
+            print(f"⚠️ Analysis cache write failed: {e}")
+
+    def _evict(self, conn):
+        """Over max_bytes: drops the least recently used entries down to 90% (not on every write)."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM analyses ORDER BY last_used ASC"):
+            if total - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM analyses WHERE key = ?", victims)
+        print(f"🧹 Analysis cache: evicted {len(victims)} entries ({freed // 1024} KB)")
+
+analysis_cache = AnalysisCache()
@@ -0,0 +1,95 @@
+import os
+import uuid
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+from cachetools import TTLCache
+
+ANALYZE_WORKERS = int(os.environ.get("ANALYZE_WORKERS", 2))
+ANALYZE_MAX_PENDING = int(os.environ.get("ANALYZE_MAX_PENDING", 100))
+ANALYZE_JOB_TTL = int(os.environ.get("ANALYZE_JOB_TTL", 3600)) # Finished jobs can be polled for an hour
+
+def payload_key(payload):
+    """Identical payloads (same comments, stats and teams, any key order) share one job."""
+    return hashlib.sha1(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+class AnalysisJob:
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = "queued"   # queued -> running -> done | error
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        self.done = threading.Event()
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+class AnalysisQueue:
+    """
+    Runs analyses on a small background thread pool so request threads never wait on Gemini
+    (its rate-limit backoff can take minutes). Jobs are polled by id; identical payloads that
+    are still queued or running are attached to the existing job instead of spending quota twice.
+    """
+    def __init__(self, analyze, max_workers=ANALYZE_WORKERS, max_pending=ANALYZE_MAX_PENDING, ttl=ANALYZE_JOB_TTL):
+        self.analyze = analyze
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analyze")
+        self._jobs = TTLCache(maxsize=max(max_pending * 10, 100), ttl=ttl)
+        self._in_flight = {}  # payload key -> job
+        self._lock = threading.Lock()
+
+    def submit(self, payload):
+        """Returns (job, created). Job is None when too many analyses are already pending."""
+        key = payload_key(payload)
+        with self._lock:
+            job = self._in_flight.get(key)
+            if job is not None:
+                return job, False
+            if len(self._in_flight) >= self.max_pending:
+                return None, False
+
+            job = AnalysisJob(key)
+            self._in_flight[key] = job
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, payload)
+        return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, payload):
+        job.status = "running"
+        try:
+            result = self.analyze(payload["comments"], payload.get("stats_data"), payload.get("teams"))
+            if "error" in result:
+                job.error, job.status = result["error"], "error"
+            else:
+                job.result, job.status = result, "done"
+        except Exception as e:
+            job.error, job.status = str(e), "error"
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            with self._lock:
+                self._in_flight.pop(job.key, None)
+                # Re-insert so the TTL counts from completion, not from submission
+                self._jobs[job.id] = job
+            job.done.set()
+            print(f"🧠 Analysis job {job.id} finished: {job.status}")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,105 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_MODEL = "gemini-2.0-flash-exp"
+FAKE_ANALYZER_LATENCY = float(os.environ.get("FAKE_ANALYZER_LATENCY", 1.0))
+
+# "1. 'match_summary' (Stringa): ..." -> the JSON keys a prompt asks for
+_REQUESTED_KEY_RE = re.compile(r"\d\.\s*'([a-z_]+)'")
+DEFAULT_KEYS = [
+    "match_summary", "detailed_corners_analysis", "detailed_goals_analysis",
+    "detailed_shots_analysis", "detailed_fouls_analysis", "detailed_cards_analysis"
+]
+
+class GeminiBackend:
+    """
+    Long-lived Gemini client: the API key is configured once per process and the model object
+    is reused by every call (and thread) instead of being rebuilt per request.
+    """
+    name = "gemini"
+
+    def __init__(self, model_name=DEFAULT_MODEL):
+        import google.generativeai as genai # Only needed (and installed) for the real backend
+        self.genai = genai
+        self.model_name = model_name
+        self.api_key = os.environ.get("GEMINI_API_KEY")
+        self.model = None
+        if self.api_key:
+            genai.configure(api_key=self.api_key)
+            self.model = genai.GenerativeModel(model_name)
+        self.generation_config = genai.types.GenerationConfig(response_mime_type="application/json")
+
+    def available(self):
+        if not self.api_key:
+            print("⚠️ Warning: GEMINI_API_KEY environment variable not set. Analysis will be skipped.")
+            return False
+        return True
+
+    def generate(self, prompt):
+        """Returns the JSON text of the completion."""
+        return self.model.generate_content(prompt, generation_config=self.generation_config).text
+
+    def stream(self, prompt):
+        """Yields the completion text chunk by chunk as the model produces it."""
+        for chunk in self.model.generate_content(prompt, generation_config=self.generation_config, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+class FakeBackend:
+    """
+    Offline stand-in for load tests and local development: answers after a fixed latency with
+    schema-valid JSON (the keys the prompt asks for), deterministic for a given prompt.
+    """
+    name = "fake"
+
+    def __init__(self, model_name="fake", latency=FAKE_ANALYZER_LATENCY):
+        self.model_name = model_name
+        self.latency = latency
+
+    def available(self):
+        return True
+
+    def _answer(self, prompt):
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+        keys = list(dict.fromkeys(_REQUESTED_KEY_RE.findall(prompt))) or DEFAULT_KEYS
+        return {key: f"Analisi simulata ({key}, prompt {digest}, {len(prompt)} caratteri)." for key in keys}
+
+    def generate(self, prompt):
+        time.sleep(self.latency)
+        return json.dumps(self._answer(prompt), ensure_ascii=False)
+
+    def stream(self, prompt):
+        """Same answer as generate(), emitted in small chunks spread over the latency."""
+        text = json.dumps(self._answer(prompt), ensure_ascii=False)
+        chunks = [text[i:i + 40] for i in range(0, len(text), 40)]
+        for chunk in chunks:
+            time.sleep(self.latency / len(chunks))
+            yield chunk
+
+BACKENDS = {"gemini": GeminiBackend, "fake": FakeBackend}
+
+_backends = {}
+_lock = threading.Lock()
+
+def get_backend(name=None, model_name=None):
+    """
+    Shared backend instance. name defaults to ANALYZER_BACKEND ('gemini' or 'fake'), read at
+    call time so the backend can be switched without a restart.
+    """
+    name = (name or os.environ.get("ANALYZER_BACKEND", "gemini")).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown analyzer backend '{name}'. Available: {list(BACKENDS)}")
+
+    key = (name, model_name)
+    with _lock:
+        if key not in _backends:
+            _backends[key] = BACKENDS[name](model_name) if model_name else BACKENDS[name]()
+        return _backends[key]
@@ -0,0 +1,164 @@
+from collections import deque
+
+import numpy as np
+from sortedcontainers import SortedList
+
+# Same as VOLATILE_STATS in frontend/src/utils/stats.js: predicted with the median by default
+VOLATILE_STATS = ["corners", "fouls", "yellow_cards", "red_cards", "offsides"]
+
+class RollingWindow:
+    """
+    Last-N values of a series (all values if size is None) with O(1) mean and O(log N)
+    updates/median: ring buffer + running sum + order-statistic list.
+    The sorted list is only maintained when the median is needed.
+    """
+    def __init__(self, size=None, track_median=True):
+        self.size = size
+        self.values = deque()
+        self.sorted = SortedList() if track_median else None
+        self.total = 0.0
+
+    def add(self, value):
+        self.values.append(value)
+        self.total += value
+        if self.sorted is not None:
+            self.sorted.add(value)
+        if self.size is not None and len(self.values) > self.size:
+            old = self.values.popleft()
+            self.total -= old
+            if self.sorted is not None:
+                self.sorted.remove(old)
+
+    def __len__(self):
+        return len(self.values)
+
+    def mean(self):
+        return self.total / len(self.values) if self.values else 0.0
+
+    def median(self):
+        n = len(self.sorted)
+        if not n:
+            return 0.0
+        mid = n // 2
+        return self.sorted[mid] if n % 2 else (self.sorted[mid - 1] + self.sorted[mid]) / 2
+
+class TeamState:
+    """Rolling for/against windows of one team: at home, away and over all its matches."""
+    def __init__(self, window, track_median=True):
+        self.windows = {
+            (context, series): RollingWindow(window, track_median)
+            for context in ("Home", "Away", "all")
+            for series in ("for", "against")
+        }
+
+    def add(self, location, stat_for, stat_against):
+        for context in (location, "all"):
+            self.windows[(context, "for")].add(stat_for)
+            self.windows[(context, "against")].add(stat_against)
+
+def sort_matches(rows):
+    """Chronological order used by findBestStrategy: by date when available, else by round."""
+    def sort_key(row):
+        giornata = row.get("giornata")
+        try:
+            giornata = int(str(giornata).lower().replace("giornata", "").strip())
+        except ValueError:
+            giornata = 0
+        return (row.get("match_date") or "", giornata, row.get("id") or 0)
+    return sorted(rows, key=sort_key)
+
+def parse_n_games(n_games):
+    """'all' -> None (whole history), anything else as in calculatePrediction (invalid/0 -> 5)."""
+    if n_games == "all":
+        return None
+    try:
+        return int(n_games) or 5
+    except (TypeError, ValueError):
+        return 5
+
+def walk_forward(rows, statistic, n_games=5, force_mean=False, use_general_stats=False):
+    """
+    Walk-forward predictions of the total of 'statistic' for every match, each one using only
+    the matches before it (same model as calculatePrediction in standard mode).
+    Per-team state is updated one match at a time, so the whole evaluation is a single linear
+    pass instead of rebuilding every team's history for every match.
+
+    Returns (predicted_totals, actual_totals) as float arrays, NaN where no prediction is
+    possible (one of the teams has no history yet). A missing statistic counts as 0, as in the
+    frontend (useMatchData maps it to 0 before calculatePrediction sees it).
+    """
+    window = parse_n_games(n_games)
+    use_median = statistic in VOLATILE_STATS and not force_mean
+    home_context, away_context = ("all", "all") if use_general_stats else ("Home", "Away")
+
+    teams = {}
+    predicted, actual = [], []
+
+    for row in sort_matches(rows):
+        home, away = row.get("home_team"), row.get("away_team")
+        value_home, value_away = row.get(f"home_{statistic}"), row.get(f"away_{statistic}")
+        if not home or not away:
+            continue
+        value_home, value_away = float(value_home or 0), float(value_away or 0)
+
+        prediction = np.nan
+        if home in teams and away in teams:
+            agg = RollingWindow.median if use_median else RollingWindow.mean
+            home_windows, away_windows = teams[home].windows, teams[away].windows
+
+            h_for = agg(home_windows[(home_context, "for")])
+            h_ag = agg(home_windows[(home_context, "against")])
+            a_for = agg(away_windows[(away_context, "for")])
+            a_ag = agg(away_windows[(away_context, "against")])
+            prediction = (h_for + a_ag) / 2 + (a_for + h_ag) / 2
+
+        predicted.append(prediction)
+        actual.append(value_home + value_away)
+
+        for team in (home, away):
+            if team not in teams:
+                teams[team] = TeamState(window, track_median=use_median)
+        teams[home].add("Home", value_home, value_away)
+        teams[away].add("Away", value_away, value_home)
+
+    return np.array(predicted, dtype=np.float64), np.array(actual, dtype=np.float64)
+
+def evaluate_bets(predicted, actual, soft_buffer=0, min_prediction=0, max_line_cap=None):
+    """
+    Betting rule of evaluateStrategy: bet the 'over' on round(prediction - soft_buffer) - 0.5,
+    capped at max_line_cap, skipping predictions below min_prediction.
+    """
+    bets = ~np.isnan(predicted) & (np.nan_to_num(predicted) > 0)
+    if min_prediction > 0:
+        bets &= np.nan_to_num(predicted) >= min_prediction
+
+    adjusted = predicted - soft_buffer if soft_buffer > 0 else predicted
+    line = np.floor(adjusted + 0.5) - 0.5  # Math.round rounds halves up
+    if max_line_cap is not None and max_line_cap > 0:
+        line = np.minimum(line, max_line_cap)
+
+    wins = int(np.count_nonzero(bets & (actual > line)))
+    total_bets = int(np.count_nonzero(bets))
+    return {
+        "winRate": wins / total_bets if total_bets else 0,
+        "totalBets": total_bets,
+        "wins": wins
+    }
+
+def evaluate_strategy(rows, statistic, model_params, betting_params=None):
+    """Backend equivalent of evaluateStrategy in frontend/src/utils/backtest.js."""
+    predicted, actual = walk_forward(
+        rows,
+        statistic,
+        n_games=model_params.get("nGames", 5),
+        force_mean=model_params.get("forceMean", False),
+        use_general_stats=model_params.get("useGeneralStats", False)
+    )
+    betting_params = betting_params or {}
+    return evaluate_bets(
+        predicted,
+        actual,
+        soft_buffer=betting_params.get("softBuffer", 0),
+        min_prediction=betting_params.get("minPrediction", 0),
+        max_line_cap=betting_params.get("maxLineCap")
+    )
@@ -0,0 +1,192 @@
+import os
+import re
+
+# Bump when the digest format changes: it is part of the analysis cache key
+DIGEST_VERSION = 1
+COMMENTARY_TOKEN_BUDGET = int(os.environ.get("COMMENTARY_TOKEN_BUDGET", 1200))
+WINDOW_MINUTES = 15
+CLUSTER_MIN_EVENTS = 3 # Corners/fouls of one team in one window that make a "cluster"
+
+_MINUTE_RE = re.compile(r"(\d+)\s*(?:\+\s*(\d+))?")
+
+def parse_minute(time_str):
+    """"45+2'" -> (45, 2), "90'" -> (90, 0), unparsable -> None."""
+    match = _MINUTE_RE.search(str(time_str or ""))
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2) or 0)
+
+def classify(comment):
+    """Event kind of a commentary line, from the incident icon first and the text as fallback."""
+    event_type = (comment.get("type") or "").lower()
+    text = (comment.get("text") or "").lower()
+
+    if "own goal" in event_type or "autogol" in text:
+        return "own_goal"
+    if "soccer" in event_type or "goal" in event_type or text.startswith(("gol!", "goal!", "gol ", "goal ")):
+        return "goal"
+    if "red" in event_type or "cartellino rosso" in text or "espuls" in text:
+        return "red_card"
+    if "yellow" in event_type or "cartellino giallo" in text or "ammonit" in text:
+        return "yellow_card"
+    if "penalty" in event_type or "rigore" in text:
+        return "penalty"
+    if "var" in event_type.split() or " var " in f" {text} ":
+        return "var"
+    if "corner" in event_type or "calcio d'angolo" in text or "corner" in text:
+        return "corner"
+    if "fallo" in text or "foul" in text:
+        return "foul"
+    if "substitution" in event_type or "sostituzione" in text:
+        return "substitution"
+    return "general"
+
+def team_side(text, teams):
+    """'home'/'away' for the team a line is about: '(Team)' mentions first, then any mention."""
+    if not teams:
+        return None
+    text = (text or "").lower()
+    names = {side: (teams.get(side) or "").lower() for side in ("home", "away")}
+    for pattern in ("({})", "{}"):
+        positions = {
+            side: text.find(pattern.format(name)) for side, name in names.items()
+            if name and pattern.format(name) in text
+        }
+        if positions:
+            return min(positions, key=positions.get)
+    return None
+
+def chronological(comments):
+    """The site lists commentary newest first; returns (minute_key, comment) oldest first."""
+    parsed = [(parse_minute(c.get("time")), c) for c in comments]
+    timed = [m for m, _ in parsed if m]
+    if len(timed) > 1 and timed[0] > timed[-1]:
+        parsed.reverse()
+    # Unparsable times stay next to their neighbours
+    last = (0, 0)
+    keyed = []
+    for minute, comment in parsed:
+        last = minute or last
+        keyed.append((last, comment))
+    keyed.sort(key=lambda item: item[0])
+    return keyed
+
+def _window_label(minute):
+    start = min(minute[0] // WINDOW_MINUTES * WINDOW_MINUTES, 90 - WINDOW_MINUTES)
+    return f"{start}-{start + WINDOW_MINUTES}'"
+
+def digest_commentary(comments, teams=None):
+    """
+    Structured features of a match commentary: goals with the running score, card timeline,
+    corners/fouls per 15-minute window and per team, and the clusters among them.
+    """
+    score = {"home": 0, "away": 0}
+    goals, cards, windows = [], [], {}
+    events = []
+
+    for minute, comment in chronological(comments):
+        kind = classify(comment)
+        side = team_side(comment.get("text"), teams)
+        events.append((minute, kind, side, comment))
+
+        if kind in ("goal", "own_goal"):
+            # An own goal is described with the player's team: it counts for the other side
+            scorer = side if kind == "goal" else {"home": "away", "away": "home"}.get(side)
+            if scorer:
+                score[scorer] += 1
+            goals.append({"minute": _fmt(minute), "side": scorer, "score": f"{score['home']}-{score['away']}"})
+        elif kind in ("yellow_card", "red_card"):
+            cards.append({
+                "minute": _fmt(minute), "side": side, "card": "rosso" if kind == "red_card" else "giallo",
+                "score": f"{score['home']}-{score['away']}"
+            })
+        elif kind in ("corner", "foul"):
+            window = windows.setdefault(_window_label(minute), {
+                "corner": {"home": 0, "away": 0, None: 0}, "foul": {"home": 0, "away": 0, None: 0},
+                "score": f"{score['home']}-{score['away']}"
+            })
+            window[kind][side] += 1
+
+    clusters = [
+        {"window": label, "kind": kind, "side": side, "count": counts[side], "score_at_start": window["score"]}
+        for label, window in windows.items()
+        for kind in ("corner", "foul")
+        for counts in (window[kind],)
+        for side in ("home", "away")
+        if counts[side] >= CLUSTER_MIN_EVENTS
+    ]
+    return {"goals": goals, "cards": cards, "windows": windows, "clusters": clusters, "events": events, "final_score": score}
+
+def _fmt(minute):
+    return f"{minute[0]}+{minute[1]}'" if minute[1] else f"{minute[0]}'"
+
+# Lines the analysis needs verbatim first: decisive events, then what explains corners/fouls
+_PRIORITY = {"goal": 0, "own_goal": 0, "red_card": 1, "penalty": 1, "var": 2, "yellow_card": 3, "corner": 4, "foul": 5, "substitution": 7, "general": 8}
+
+def salient_lines(events, clusters, token_budget=COMMENTARY_TOKEN_BUDGET):
+    """
+    Picks the most informative commentary lines within ~token_budget tokens (4 chars/token),
+    kept in match order. Lines right before a goal or inside a cluster are promoted,
+    generic play-by-play filler is left out (the digest already carries the flow).
+    """
+    goal_minutes = [m[0] for m, kind, _, _ in events if kind in ("goal", "own_goal")]
+    cluster_windows = {(c["window"], c["kind"]) for c in clusters}
+
+    ranked = []
+    for index, (minute, kind, _, comment) in enumerate(events):
+        priority = _PRIORITY.get(kind, 8)
+        if (_window_label(minute), kind) in cluster_windows:
+            priority = min(priority, 3)
+        if kind == "general" and any(0 <= g - minute[0] <= 2 for g in goal_minutes):
+            priority = 4 # Build-up of a goal
+        if priority < _PRIORITY["general"]:
+            ranked.append((priority, index))
+    ranked.sort()
+
+    budget = token_budget * 4
+    chosen = []
+    for _, index in ranked:
+        minute, _, _, comment = events[index]
+        line = f"[{comment.get('time', 'N/A')}] {comment.get('text', '')}"
+        if len(line) > budget:
+            continue
+        budget -= len(line) + 1
+        chosen.append((index, line))
+    return [line for _, line in sorted(chosen)]
+
+def format_digest(comments, teams=None, token_budget=COMMENTARY_TOKEN_BUDGET):
+    """Prompt section replacing the raw commentary: the digest plus the salient lines."""
+    digest = digest_commentary(comments, teams)
+    home = (teams or {}).get("home") or "Casa"
+    away = (teams or {}).get("away") or "Ospite"
+    name = {"home": home, "away": away, None: "?"}
+
+    lines = ["SINTESI CRONACA (estratta automaticamente dalla cronaca completa):"]
+    if digest["goals"]:
+        lines.append("Gol: " + "; ".join(f"{g['minute']} {name[g['side']]} ({g['score']})" for g in digest["goals"]))
+    else:
+        lines.append("Gol: nessuno rilevato nella cronaca")
+    if digest["cards"]:
+        lines.append("Cartellini: " + "; ".join(
+            f"{c['minute']} {c['card']} {name[c['side']]} (sul {c['score']})" for c in digest["cards"]
+        ))
+    if digest["windows"]:
+        lines.append(f"Corner e falli per fascia ({home} / {away}, n.d. = squadra non riconosciuta):")
+
+        def counts(c):
+            return f"{c['home']}/{c['away']}" + (f" +{c[None]} n.d." if c[None] else "")
+
+        for label in sorted(digest["windows"], key=lambda l: int(l.split("-")[0])):
+            w = digest["windows"][label]
+            lines.append(
+                f"  {label} corner {counts(w['corner'])}, falli {counts(w['foul'])} (punteggio a inizio fascia {w['score']})"
+            )
+    if digest["clusters"]:
+        lines.append("Cluster: " + "; ".join(
+            f"{c['count']} {'corner' if c['kind'] == 'corner' else 'falli'} {name[c['side']]} nella fascia {c['window']} (sul {c['score_at_start']})"
+            for c in digest["clusters"]
+        ))
+
+    lines.append("\nCronaca (righe salienti, in ordine):")
+    lines += salient_lines(digest["events"], digest["clusters"], token_budget)
+    return "\n".join(lines) + "\n"
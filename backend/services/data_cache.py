@@ -0,0 +1,154 @@
+import os
+import sys
+import time
+import threading
+import requests
+from cachetools import TTLCache
+from dotenv import load_dotenv
+
+# Supabase table holding one row per data table: (table_name text primary key, version bigint).
+# Writers upsert a new version after every write, readers poll it to know when cached data is stale.
+VERSION_TABLE = "data_versions"
+VERSION_POLL_SECONDS = float(os.environ.get("DATA_VERSION_POLL_SECONDS", 10))
+REQUEST_TIMEOUT = 5 # Seconds, for both the version read and the bump
+
+_lock = threading.Lock()
+_local_versions = {}    # Bumped by writers running in this process
+_remote_versions = {}   # Last snapshot of the VERSION_TABLE
+_remote_checked_at = 0.0
+_remote_warning_shown = False
+
+def _rest_config():
+    """Returns (base_url, headers) for the Supabase REST API, or None if not configured."""
+    load_dotenv()
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_KEY")
+    if not url or not key:
+        return None
+
+    headers = {
+        "apikey": key,
+        "Authorization": f"Bearer {key}",
+        "Content-Type": "application/json"
+    }
+    return url, headers
+
+def bump_data_version(*tables):
+    """
+    Marks one or more tables as changed. Must be called by every writer after a successful write.
+    The in-process counter invalidates caches living in the same process immediately,
+    the row in VERSION_TABLE invalidates the API process (scrapers run as separate jobs).
+    """
+    if not tables:
+        return
+
+    with _lock:
+        for table in tables:
+            _local_versions[table] = _local_versions.get(table, 0) + 1
+
+    config = _rest_config()
+    if not config:
+        return
+    base_url, headers = config
+
+    # Millisecond timestamp: monotonic across writers without a read-modify-write round trip
+    version = time.time_ns() // 1_000_000
+    rows = [{"table_name": table, "version": version} for table in tables]
+    try:
+        resp = requests.post(
+            f"{base_url}/rest/v1/{VERSION_TABLE}?on_conflict=table_name",
+            json=rows,
+            headers={**headers, "Prefer": "resolution=merge-duplicates,return=minimal"},
+            timeout=REQUEST_TIMEOUT
+        )
+        resp.raise_for_status()
+        print(f"🔖 Bumped data version for {', '.join(tables)}")
+    except Exception as e:
+        print(f"⚠️ Could not persist data version for {', '.join(tables)}: {e}")
+
+def _refresh_remote_versions():
+    """
+    Reloads VERSION_TABLE if the last snapshot is older than VERSION_POLL_SECONDS. Single-flight:
+    one caller fetches outside the lock while the others keep using the previous snapshot.
+    """
+    global _remote_checked_at, _remote_versions, _remote_warning_shown
+
+    with _lock:
+        now = time.monotonic()
+        if now - _remote_checked_at < VERSION_POLL_SECONDS:
+            return
+        _remote_checked_at = now # Also marks the refresh as in flight for the other callers
+
+    config = _rest_config()
+    if not config:
+        return
+    base_url, headers = config
+
+    try:
+        resp = requests.get(f"{base_url}/rest/v1/{VERSION_TABLE}?select=table_name,version", headers=headers, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        versions = {row["table_name"]: row["version"] for row in resp.json()}
+        with _lock:
+            _remote_versions = versions
+    except Exception as e:
+        # Without the version table we still serve from cache, the TTL bounds the staleness.
+        if not _remote_warning_shown:
+            print(f"⚠️ Could not read '{VERSION_TABLE}', falling back to TTL-only caching: {e}")
+            _remote_warning_shown = True
+
+def get_data_version(table):
+    """Returns an opaque version token for a table that changes after every write."""
+    _refresh_remote_versions()
+    with _lock:
+        return f"{_remote_versions.get(table, 0)}.{_local_versions.get(table, 0)}"
+
+def rows_size(value):
+    """
+    Approximate memory of a cached value in bytes: len() of encoded bodies, sys.getsizeof of
+    the list, dicts and values of row lists (column names are shared, so not counted).
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values()) if isinstance(row, dict) else sys.getsizeof(row)
+            for row in value
+        )
+    return sys.getsizeof(value)
+
+class VersionedCache:
+    """
+    TTL + LRU cache whose keys include the current data version of the table.
+    A sync bumps the version, so the next read misses and reloads instead of serving stale rows;
+    the old entries simply age out of the LRU.
+    With getsizeof (e.g. rows_size) maxsize is a total size instead of an entry count, and values
+    larger than the whole cache are returned without being stored.
+    """
+    def __init__(self, maxsize=32, ttl=300, getsizeof=None):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl, getsizeof=getsizeof)
+        self._lock = threading.Lock()
+
+    def get(self, table, params):
+        """Returns the cached value for the current data version, or None (never loads)."""
+        key = (table, get_data_version(table), params)
+        with self._lock:
+            return self._cache.get(key)
+
+    def get_or_load(self, table, params, loader):
+        key = (table, get_data_version(table), params)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+
+        value = loader()
+
+        with self._lock:
+            try:
+                self._cache[key] = value
+            except ValueError:
+                pass # Too large for this cache
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
@@ -1,53 +1,64 @@
-import os
-import google.generativeai as genai
-import time
-from dotenv import load_dotenv
 import json
 
-def configure_gemini():
-    """Configures the Gemini API with the key from environment variables."""
-    load_dotenv() # Load variables from .env
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        print("⚠️ Warning: GEMINI_API_KEY environment variable not set. Analysis will be skipped.")
-        return False
-    
-    genai.configure(api_key=api_key)
-    return True
+from backend.services.analysis_cache import analysis_cache, analysis_key
+from backend.services.gemini_scheduler import get_scheduler, estimate_tokens
+from backend.services.commentary_digest import format_digest, DIGEST_VERSION, COMMENTARY_TOKEN_BUDGET
+from backend.services.analyzer_backends import get_backend
+from backend.services.json_sections import JsonSectionScanner
 
-def analyze_match_comments(comments_list, stats_data=None, teams=None):
+EXPECTED_KEYS = [
+    "match_summary", "detailed_corners_analysis", "detailed_goals_analysis",
+    "detailed_shots_analysis", "detailed_fouls_analysis", "detailed_cards_analysis"
+]
+
+SYSTEM_PROMPT = (
+    "Sei un analista di calcio professionista esperto in data analytics. Il tuo obiettivo è fornire un'analisi TATTICA e CAUSALE per scommettitori esperti.\n"
+    "Non limitarti a descrivere i numeri, devi spiegare il PERCHÉ (Reasoning) dietro di essi collegando eventi, statistiche e cronaca.\n\n"
+    "Output richiesto (JSON):\n"
+    "1. 'match_summary' (Stringa): Narrazione critica del match. Chi ha dominato territorialmente? Chi ha sfruttato meglio le occasioni? Menziona l'inerzia della partita.\n"
+    "2. 'detailed_corners_analysis' (Stringa): Analisi CAUSALE sui corner. Esempio: 'Il numero alto di corner della squadra X è dovuto alla spinta costante sulle fasce o a tiri deviati...'. Collega al possesso palla se rilevante.\n"
+    "3. 'detailed_goals_analysis' (Stringa): Analisi della qualità dei gol e xG. I gol sono stati frutto di azioni manovrate, errori difensivi o calci piazzati? Il risultato è giusto rispetto agli xG prodotti?\n"
+    "4. 'detailed_shots_analysis' (Stringa): Analisi volume vs pericolosità. Una squadra ha tirato tanto ma da fuori (basso xG) o ha creato occasioni nitide? Efficienza al tiro.\n"
+    "5. 'detailed_fouls_analysis' (Stringa): Analisi dell'aggressività e del ritmo. I falli sono stati tattici per fermare ripartenze? C'è stata frustrazione? Collega i falli ai cartellini.\n"
+    "6. 'detailed_cards_analysis' (Stringa): Analisi disciplinare. I cartellini hanno cambiato l'inerzia? (es. un rosso ha costretto la squadra a difendersi). C'è nervosismo?\n\n"
+    "REGOLE FONDAMENTALI:\n"
+    "- NON fare elenchi puntati sterili.\n"
+    "- USA connettivi logici: 'di conseguenza', 'causato da', 'questo ha portato a', 'nonostante'.\n"
+    "- CITA SEMPRE i dati a supporto delle tue tesi.\n"
+    "- Scrivi in ITALIANO professionale."
+)
+
+# Identifies everything that shapes the prompt besides the match data (analysis cache key)
+PROMPT_TEMPLATE_ID = f"{SYSTEM_PROMPT}|digest-v{DIGEST_VERSION}|budget-{COMMENTARY_TOKEN_BUDGET}"
+
+def format_commentary(comments_list, teams=None):
     """
-    Sends match comments to Gemini for analysis.
-    
-    Args:
-        comments_list (list): List of dictionaries with 'time', 'type', 'text'.
-        stats_data (dict, optional): Full dictionary of stats (corners, fouls, shots, xg, etc.)
-        teams (dict, optional): {'home': 'Team A', 'away': 'Team B'}
-        
-    Returns:
-        dict: The analysis result from Gemini (JSON), or an error dict.
+    Commentary section of the prompt: the local digest (score, clusters, cards) plus the
+    salient lines within COMMENTARY_TOKEN_BUDGET. A budget <= 0 sends every line as before.
     """
-    if not configure_gemini():
-        return {"error": "Analysis skipped: No API Key."}
+    if COMMENTARY_TOKEN_BUDGET > 0:
+        return format_digest(comments_list, teams, COMMENTARY_TOKEN_BUDGET)
 
-    if not comments_list:
-        return {"error": "No comments available for analysis."}
-
-    # Format comments into a single string for the prompt
     formatted_comments = "Match Commentary:\n"
     goals_list = []
-    
     for c in comments_list:
         text = c.get('text', '')
         event_type = c.get('type', '').lower()
         time_str = c.get('time', 'N/A')
-        
+
         formatted_comments += f"[{time_str}] {c.get('type', '')}: {text}\n"
-        
+
         # Identify Goals
         if 'goal' in event_type or 'soccer' in event_type or 'ball' in event_type or 'goal' in text.lower():
             goals_list.append(f"- {time_str}: {text}")
 
+    goals_section = ""
+    if goals_list:
+        goals_section = "\nGOL SEGNATI (Usa questi per capire l'evoluzione del punteggio):\n" + "\n".join(goals_list) + "\n"
+    return f"{goals_section}\n{formatted_comments}"
+
+def build_prompt(comments_list, stats_data=None, teams=None):
+    """Full prompt: instructions, official stats and the commentary section."""
     # Add Official Stats to Prompt
     stats_section = ""
     if stats_data:
@@ -71,63 +82,102 @@ def analyze_match_comments(comments_list, stats_data=None, teams=None):
         stats_section += f"--------------------------------------------------\n"
         stats_section += f"IMPORTANTE: {home_team_name} è la squadra di casa, {away_team_name} è la squadra ospite.\n"
 
-    # Add Goals Section
-    goals_section = ""
-    if goals_list:
-        goals_section = "\nGOL SEGNATI (Usa questi per capire l'evoluzione del punteggio):\n" + "\n".join(goals_list) + "\n"
+    return f"{SYSTEM_PROMPT}\n{stats_section}\n{format_commentary(comments_list, teams)}"
 
-    system_prompt = (
-        "Sei un analista di calcio professionista esperto in data analytics. Il tuo obiettivo è fornire un'analisi TATTICA e CAUSALE per scommettitori esperti.\n"
-        "Non limitarti a descrivere i numeri, devi spiegare il PERCHÉ (Reasoning) dietro di essi collegando eventi, statistiche e cronaca.\n\n"
-        "Output richiesto (JSON):\n"
-        "1. 'match_summary' (Stringa): Narrazione critica del match. Chi ha dominato territorialmente? Chi ha sfruttato meglio le occasioni? Menziona l'inerzia della partita.\n"
-        "2. 'detailed_corners_analysis' (Stringa): Analisi CAUSALE sui corner. Esempio: 'Il numero alto di corner della squadra X è dovuto alla spinta costante sulle fasce o a tiri deviati...'. Collega al possesso palla se rilevante.\n"
-        "3. 'detailed_goals_analysis' (Stringa): Analisi della qualità dei gol e xG. I gol sono stati frutto di azioni manovrate, errori difensivi o calci piazzati? Il risultato è giusto rispetto agli xG prodotti?\n"
-        "4. 'detailed_shots_analysis' (Stringa): Analisi volume vs pericolosità. Una squadra ha tirato tanto ma da fuori (basso xG) o ha creato occasioni nitide? Efficienza al tiro.\n"
-        "5. 'detailed_fouls_analysis' (Stringa): Analisi dell'aggressività e del ritmo. I falli sono stati tattici per fermare ripartenze? C'è stata frustrazione? Collega i falli ai cartellini.\n"
-        "6. 'detailed_cards_analysis' (Stringa): Analisi disciplinare. I cartellini hanno cambiato l'inerzia? (es. un rosso ha costretto la squadra a difendersi). C'è nervosismo?\n\n"
-        "REGOLE FONDAMENTALI:\n"
-        "- NON fare elenchi puntati sterili.\n"
-        "- USA connettivi logici: 'di conseguenza', 'causato da', 'questo ha portato a', 'nonostante'.\n"
-        "- CITA SEMPRE i dati a supporto delle tue tesi.\n"
-        "- Scrivi in ITALIANO professionale."
-    )
-
-    full_prompt = f"{system_prompt}\n{stats_section}\n{goals_section}\n{formatted_comments}"
-
-    max_retries = 5
-    base_delay = 30 # Start with 30 seconds
-
-    generation_config = genai.types.GenerationConfig(
-        response_mime_type="application/json"
-    )
-
-    for attempt in range(max_retries):
-        try:
-            model = genai.GenerativeModel('gemini-2.0-flash-exp')
-            response = model.generate_content(full_prompt, generation_config=generation_config)
-            
-            # Parse JSON string to dict
-            result = json.loads(response.text)
-            
-            # Fallback for missing tldr
-            # Fallback for missing keys (robustness) - ensure all keys exist
-            expected_keys = [
-                "match_summary", "detailed_corners_analysis", "detailed_goals_analysis", 
-                "detailed_shots_analysis", "detailed_fouls_analysis", "detailed_cards_analysis"
-            ]
-            for k in expected_keys:
-                if k not in result:
-                    result[k] = "Dati non disponibili per questa analisi."
-                
-            return result
-            
-        except Exception as e:
-            if "429" in str(e) or "Quota exceeded" in str(e):
-                if attempt < max_retries - 1:
-                    sleep_time = base_delay * (2 ** attempt) # Exponential backoff: 30, 60, 120, 240...
-                    print(f"    -> Rate limit hit. Retrying in {sleep_time}s...")
-                    time.sleep(sleep_time)
-                    continue
-            return {"error": f"Error during Gemini analysis: {str(e)}"}
-    return {"error": "Error: Max retries exceeded."}
+def analyze_match_comments(comments_list, stats_data=None, teams=None):
+    """
+    Sends match comments to Gemini for analysis.
+    
+    Args:
+        comments_list (list): List of dictionaries with 'time', 'type', 'text'.
+        stats_data (dict, optional): Full dictionary of stats (corners, fouls, shots, xg, etc.)
+        teams (dict, optional): {'home': 'Team A', 'away': 'Team B'}
+        
+    Returns:
+        dict: The analysis result from Gemini (JSON), or an error dict.
+    """
+    if not comments_list:
+        return {"error": "No comments available for analysis."}
+
+    backend = get_backend() # 'gemini' or the offline 'fake', see ANALYZER_BACKEND
+
+    # Re-scrapes and re-posts of the same match are served without spending quota
+    cache_key = analysis_key(comments_list, stats_data, teams, PROMPT_TEMPLATE_ID, backend.model_name)
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        print("    -> Analysis served from cache.")
+        return cached
+
+    if not backend.available():
+        return {"error": "Analysis skipped: No API Key."}
+
+    full_prompt = build_prompt(comments_list, stats_data, teams)
+
+    try:
+        # Shared RPM/TPM budget and 429 backoff for every caller of this process
+        text = get_scheduler().call(lambda: backend.generate(full_prompt), tokens=estimate_tokens(full_prompt))
+
+        # Parse JSON string to dict
+        result = json.loads(text)
+
+        # Fallback for missing keys (robustness) - ensure all keys exist
+        for k in EXPECTED_KEYS:
+            if k not in result:
+                result[k] = "Dati non disponibili per questa analisi."
+
+        analysis_cache.put(cache_key, result, backend.model_name)
+        return result
+
+    except Exception as e:
+        return {"error": f"Error during Gemini analysis: {str(e)}"}
+
+def stream_match_analysis(comments_list, stats_data=None, teams=None):
+    """
+    Streaming analyze_match_comments: yields ("section", key, text) for each top-level field of
+    the answer as soon as the model has finished writing it, then ("done", None, result) with
+    the complete dict, or ("error", None, message).
+    """
+    if not comments_list:
+        yield "error", None, "No comments available for analysis."
+        return
+
+    backend = get_backend()
+    cache_key = analysis_key(comments_list, stats_data, teams, PROMPT_TEMPLATE_ID, backend.model_name)
+    cached = analysis_cache.get(cache_key)
+    if cached is not None:
+        for key, value in cached.items():
+            yield "section", key, value
+        yield "done", None, cached
+        return
+
+    if not backend.available():
+        yield "error", None, "Analysis skipped: No API Key."
+        return
+
+    full_prompt = build_prompt(comments_list, stats_data, teams)
+    scanner = JsonSectionScanner()
+    result = {}
+    try:
+        for chunk in get_scheduler().stream(lambda: backend.stream(full_prompt), tokens=estimate_tokens(full_prompt)):
+            for key, value in scanner.feed(chunk):
+                result[key] = value
+                yield "section", key, value
+    except Exception as e:
+        yield "error", None, f"Error during Gemini analysis: {str(e)}"
+        return
+
+    if not result:
+        yield "error", None, "Error during Gemini analysis: empty or invalid JSON answer"
+        return
+
+    for k in EXPECTED_KEYS:
+        if k not in result:
+            result[k] = "Dati non disponibili per questa analisi."
+            yield "section", k, result[k]
+
+    analysis_cache.put(cache_key, result, backend.model_name)
+    yield "done", None, result
+
+def submit_analysis(comments_list, stats_data=None, teams=None):
+    """analyze_match_comments in the background (Future), so the scraper keeps scraping meanwhile."""
+    return get_scheduler().submit(analyze_match_comments, comments_list, stats_data, teams)
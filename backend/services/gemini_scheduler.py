@@ -0,0 +1,132 @@
+import os
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Free-tier defaults for the flash models, override per API key
+GEMINI_RPM = float(os.environ.get("GEMINI_RPM", 15))
+GEMINI_TPM = float(os.environ.get("GEMINI_TPM", 1_000_000))
+GEMINI_CONCURRENCY = int(os.environ.get("GEMINI_CONCURRENCY", 4))
+GEMINI_MAX_RETRIES = int(os.environ.get("GEMINI_MAX_RETRIES", 5))
+GEMINI_BASE_BACKOFF = float(os.environ.get("GEMINI_BASE_BACKOFF", 5))
+GEMINI_MAX_BACKOFF = float(os.environ.get("GEMINI_MAX_BACKOFF", 120))
+GEMINI_OUTPUT_TOKENS = int(os.environ.get("GEMINI_OUTPUT_TOKENS", 1500)) # Reserved per call for the JSON answer
+
+def estimate_tokens(prompt):
+    """~4 characters per token, plus the expected answer. Only used for budgeting."""
+    return len(prompt) // 4 + GEMINI_OUTPUT_TOKENS
+
+def is_rate_limit_error(error):
+    message = str(error)
+    return "429" in message or "Quota exceeded" in message or "RESOURCE_EXHAUSTED" in message
+
+class TokenBucket:
+    """
+    Refills 'rate_per_minute' units per minute, holds at most 'capacity' (the allowed burst).
+    acquire() blocks until enough units are available. A request bigger than the capacity waits
+    for a full bucket and leaves it in debt, so later requests repay its whole cost.
+    """
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        # Default burst: one second of budget, so no 60s window can see much more than the quota
+        self.capacity = capacity or max(1.0, rate_per_minute / 60)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        needed = min(amount, self.capacity) # A request bigger than the burst waits for a full bucket
+        while True:
+            with self._lock:
+                self._refill()
+                if self.level >= needed:
+                    self.level -= amount # May go negative: the excess is charged to the next requests
+                    return
+                wait = (needed - self.level) / self.rate
+            time.sleep(wait)
+
+class GeminiScheduler:
+    """
+    Shared gate in front of every Gemini call of the process (scraper and /analyze):
+    requests/minute and tokens/minute budgets, a concurrency cap, and per-request jittered
+    backoff on 429s so one rate-limited call does not stall the others.
+    """
+    def __init__(self, rpm=GEMINI_RPM, tpm=GEMINI_TPM, max_concurrency=GEMINI_CONCURRENCY,
+                 max_retries=GEMINI_MAX_RETRIES, base_backoff=GEMINI_BASE_BACKOFF, max_backoff=GEMINI_MAX_BACKOFF):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def call(self, fn, tokens=0):
+        """
+        Runs fn() within the budgets, retrying rate-limit errors with jittered exponential
+        backoff. Other errors (and the last rate-limit error) are raised to the caller.
+        """
+        attempts = max(1, self.max_retries) # max_retries=0 still makes the call once
+        for attempt in range(attempts):
+            self.requests.acquire(1)
+            if tokens:
+                self.tokens.acquire(tokens)
+            with self._slots:
+                try:
+                    return fn()
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt == attempts - 1:
+                        raise
+            # Sleep outside the slot: the other requests keep the concurrency
+            delay = min(self.max_backoff, self.base_backoff * (2 ** attempt)) * random.uniform(0.5, 1.5)
+            print(f"    -> Rate limit hit. Retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+    def stream(self, fn, tokens=0):
+        """
+        Like call() for a streaming fn() (returns an iterator): chunks are yielded while holding
+        a concurrency slot. Rate-limit errors are retried only before the first chunk.
+        """
+        attempts = max(1, self.max_retries)
+        for attempt in range(attempts):
+            self.requests.acquire(1)
+            if tokens:
+                self.tokens.acquire(tokens)
+            started = False
+            with self._slots:
+                try:
+                    for chunk in fn():
+                        started = True
+                        yield chunk
+                    return
+                except Exception as e:
+                    if started or not is_rate_limit_error(e) or attempt == attempts - 1:
+                        raise
+            delay = min(self.max_backoff, self.base_backoff * (2 ** attempt)) * random.uniform(0.5, 1.5)
+            print(f"    -> Rate limit hit. Retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+    def submit(self, fn, *args, **kwargs):
+        """Runs fn(*args, **kwargs) in the background (fn is expected to go through call())."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="gemini")
+        return self._executor.submit(fn, *args, **kwargs)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = GeminiScheduler()
+        return _scheduler
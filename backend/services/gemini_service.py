@@ -1,18 +1,9 @@
-import os
-import google.generativeai as genai
-import time
-from dotenv import load_dotenv
+import json
 
-def configure_gemini():
-    """Configures the Gemini API with the key from environment variables."""
-    load_dotenv() # Load variables from .env
-    api_key = os.environ.get("GEMINI_API_KEY")
-    if not api_key:
-        print("⚠️ Warning: GEMINI_API_KEY environment variable not set. Analysis will be skipped.")
-        return False
-    
-    genai.configure(api_key=api_key)
-    return True
+from backend.services.analyzer_backends import get_backend
+from backend.services.gemini_scheduler import get_scheduler, estimate_tokens
+
+MODEL_NAME = 'gemini-2.5-flash'
 
 def analyze_match_comments(comments_list, corners_data=None):
     """
@@ -25,7 +16,8 @@ def analyze_match_comments(comments_list, corners_data=None):
     Returns:
         str: The analysis text from Gemini, or an error message.
     """
-    if not configure_gemini():
+    backend = get_backend(model_name=MODEL_NAME)
+    if not backend.available():
         return "Analysis skipped: No API Key."
 
     if not comments_list:
@@ -75,31 +67,11 @@ def analyze_match_comments(comments_list, corners_data=None):
 
     full_prompt = f"{system_prompt}\n{stats_section}\n{goals_section}\n{formatted_comments}"
 
-    max_retries = 5
-    base_delay = 30 # Start with 30 seconds
-
-    generation_config = genai.types.GenerationConfig(
-        response_mime_type="application/json"
-    )
-
-    for attempt in range(max_retries):
-        try:
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            response = model.generate_content(full_prompt, generation_config=generation_config)
-            
-            # Parse JSON string to dict
-            import json
-            return json.loads(response.text)
-            
-        except Exception as e:
-            if "429" in str(e) or "Quota exceeded" in str(e):
-                if attempt < max_retries - 1:
-                    sleep_time = base_delay * (2 ** attempt) # Exponential backoff: 30, 60, 120, 240...
-                    print(f"    -> Rate limit hit. Retrying in {sleep_time}s...")
-                    time.sleep(sleep_time)
-                    continue
-            return {"error": f"Error during Gemini analysis: {str(e)}"}
-    return {"error": "Error: Max retries exceeded."}
+    try:
+        text = get_scheduler().call(lambda: backend.generate(full_prompt), tokens=estimate_tokens(full_prompt))
+        return json.loads(text)
+    except Exception as e:
+        return {"error": f"Error during Gemini analysis: {str(e)}"}
 
 if __name__ == "__main__":
     # Test block
@@ -0,0 +1,82 @@
+import json
+
+class JsonSectionScanner:
+    """
+    Incremental scanner for a streamed JSON object: feed() it text chunks as they arrive and it
+    returns the top-level (key, value) pairs completed so far, so each section of a model answer
+    can be forwarded before the whole object is done. Nested values are returned once closed.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0            # Next character to scan
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.key = None         # Last top-level key seen
+        self.expect_key = True  # At depth 1: next string is a key (True) or a value (False)
+        self.token_start = None # Start of the current top-level key or value
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        sections = []
+        while self.pos < len(self.buffer):
+            ch = self.buffer[self.pos]
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 1:
+                        token = json.loads(self.buffer[self.token_start:self.pos + 1])
+                        if self.expect_key:
+                            self.key = token
+                        else:
+                            sections.append((self.key, token))
+                        self.token_start = None
+                self.pos += 1
+                continue
+
+            if ch == '"':
+                self.in_string = True
+                if self.depth == 1:
+                    self.token_start = self.pos
+            elif ch in "{[":
+                if self.depth == 1 and not self.expect_key:
+                    self.token_start = self.pos
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 1 and self.token_start is not None:
+                    sections.append((self.key, json.loads(self.buffer[self.token_start:self.pos + 1])))
+                    self.token_start = None
+                elif self.depth == 1 or self.depth == 0:
+                    self._flush_scalar(sections)
+            elif self.depth == 1:
+                if ch == ":":
+                    self.expect_key = False
+                elif ch == ",":
+                    self._flush_scalar(sections)
+                    self.expect_key = True
+                elif not ch.isspace() and self.token_start is None and not self.expect_key:
+                    self.token_start = self.pos # Number / true / false / null
+            self.pos += 1
+
+        # Keep the buffer small: drop what can no longer be part of a pending token
+        cut = self.token_start if self.token_start is not None else self.pos
+        self.buffer, self.pos = self.buffer[cut:], self.pos - cut
+        if self.token_start is not None:
+            self.token_start = 0
+        return sections
+
+    def _flush_scalar(self, sections):
+        """Completes a pending number/true/false/null value at ',' or the closing brace."""
+        if self.token_start is None or self.expect_key:
+            return
+        end = self.pos
+        raw = self.buffer[self.token_start:end].strip()
+        if raw:
+            sections.append((self.key, json.loads(raw)))
+        self.token_start = None
@@ -0,0 +1,187 @@
+import math
+from datetime import datetime, timedelta
+
+from backend.services.backtest_engine import VOLATILE_STATS, parse_n_games
+
+def mean(values):
+    return sum(values) / len(values) if values else 0
+
+def median(values):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+def std(values):
+    """Population standard deviation, as getStdDev in the frontend."""
+    if not values:
+        return 0
+    m = mean(values)
+    return math.sqrt(mean([(v - m) ** 2 for v in values]))
+
+def pick_aggregator(statistic, aggregator="auto"):
+    if aggregator == "mean":
+        return mean
+    if aggregator == "median":
+        return median
+    return median if statistic in VOLATILE_STATS else mean
+
+class LeagueModel:
+    """
+    Everything calculatePrediction needs for one league and statistic, computed once:
+    per-team match histories (newest round first, as processData), per-team home/away
+    aggregates and the league averages used by the adjusted mode.
+    """
+    def __init__(self, rows, statistic, aggregator="auto"):
+        self.agg = pick_aggregator(statistic, aggregator)
+        self.teams = {}
+
+        for row in sorted(rows, key=lambda r: -(r.get("giornata") or 0)):
+            home, away = row.get("home_team"), row.get("away_team")
+            value_home, value_away = row.get(f"home_{statistic}"), row.get(f"away_{statistic}")
+            if not home or not away or value_home is None or value_away is None:
+                continue
+            value_home, value_away = float(value_home), float(value_away)
+            self._team(home)["matches"].append(("Home", away, value_home, value_away))
+            self._team(away)["matches"].append(("Away", home, value_away, value_home))
+
+        all_lists = {"home_for": [], "home_ag": [], "away_for": [], "away_ag": []}
+        for team in self.teams.values():
+            for location, _, stat_for, stat_ag in team["matches"]:
+                prefix = "home" if location == "Home" else "away"
+                team[f"{prefix}_for"].append(stat_for)
+                team[f"{prefix}_ag"].append(stat_ag)
+            for name in all_lists:
+                all_lists[name] += team[name]
+                # Opponent multipliers of the adjusted mode only depend on these
+                team[f"agg_{name}"] = self.agg(team[name])
+
+        self.league_avgs = {
+            "avgHomeGoals": self.agg(all_lists["home_for"]),
+            "avgAwayGoals": self.agg(all_lists["away_for"]),
+            "avgHomeConceded": self.agg(all_lists["home_ag"]),
+            "avgAwayConceded": self.agg(all_lists["away_ag"])
+        }
+
+    def _team(self, name):
+        if name not in self.teams:
+            self.teams[name] = {"matches": [], "home_for": [], "home_ag": [], "away_for": [], "away_ag": []}
+        return self.teams[name]
+
+    def _relevant(self, team, location, limit, use_general_stats):
+        matches = self.teams[team]["matches"]
+        if not use_general_stats:
+            matches = [m for m in matches if m[0] == location]
+        return matches[:limit] if limit else matches
+
+    def _adjusted(self, matches, offense, opponent_key, league_avg_key):
+        """getOpponentAdjustedStats: rescale each value by the opponent's strength."""
+        numerator = self.league_avgs[league_avg_key]
+        values = []
+        for _, opponent, stat_for, stat_ag in matches:
+            value = stat_for if offense else stat_ag
+            denominator = self.teams[opponent][opponent_key]
+            values.append(value * (numerator / denominator) if denominator else value)
+        return values
+
+    def predict(self, home, away, n_games=5, use_adjusted_mode=False, use_general_stats=False):
+        """Python port of calculatePrediction (without the match lists). None if a team is unknown."""
+        if home not in self.teams or away not in self.teams:
+            return None
+
+        limit = parse_n_games(n_games)
+        home_matches = self._relevant(home, "Home", limit, use_general_stats)
+        away_matches = self._relevant(away, "Away", limit, use_general_stats)
+
+        if use_adjusted_mode:
+            h_for_list = self._adjusted(home_matches, True, "agg_away_ag", "avgAwayConceded")
+            h_ag_list = self._adjusted(home_matches, False, "agg_away_for", "avgAwayGoals")
+            a_for_list = self._adjusted(away_matches, True, "agg_home_ag", "avgHomeConceded")
+            a_ag_list = self._adjusted(away_matches, False, "agg_home_for", "avgHomeGoals")
+        else:
+            h_for_list = [m[2] for m in home_matches]
+            h_ag_list = [m[3] for m in home_matches]
+            a_for_list = [m[2] for m in away_matches]
+            a_ag_list = [m[3] for m in away_matches]
+
+        h_for, h_ag = self.agg(h_for_list), self.agg(h_ag_list)
+        a_for, a_ag = self.agg(a_for_list), self.agg(a_ag_list)
+        h_for_std, h_ag_std = std(h_for_list), std(h_ag_list)
+        a_for_std, a_ag_std = std(a_for_list), std(a_ag_list)
+
+        totals = [f + a for f, a in zip(h_for_list, h_ag_list)] + [f + a for f, a in zip(a_for_list, a_ag_list)]
+
+        exp_home = (h_for + a_ag) / 2
+        exp_away = (a_for + h_ag) / 2
+        if use_adjusted_mode:
+            if self.league_avgs["avgAwayConceded"] > 0:
+                exp_home *= self.teams[away]["agg_away_ag"] / self.league_avgs["avgAwayConceded"]
+            if self.league_avgs["avgHomeConceded"] > 0:
+                exp_away *= self.teams[home]["agg_home_ag"] / self.league_avgs["avgHomeConceded"]
+
+        return {
+            "expHome": exp_home,
+            "expAway": exp_away,
+            "total": exp_home + exp_away,
+            "hFor": h_for,
+            "hAg": h_ag,
+            "aFor": a_for,
+            "aAg": a_ag,
+            "hForStd": h_for_std,
+            "aForStd": a_for_std,
+            "expHomeStd": 0.5 * math.sqrt(h_for_std ** 2 + a_ag_std ** 2),
+            "expAwayStd": 0.5 * math.sqrt(a_for_std ** 2 + h_ag_std ** 2),
+            "totalStd": std(totals),
+            "homeMatches": len(home_matches),
+            "awayMatches": len(away_matches)
+        }
+
+def upcoming_fixtures(fixtures, matches, now=None):
+    """
+    Fixtures not played yet, as the upcoming-matchday filter of SafestBets/HotMatches: not already
+    in the matches table and not older than 24h (fixtures without a date are kept).
+    """
+    played = {(m.get("home_team"), m.get("away_team")) for m in matches}
+    cutoff = ((now or datetime.now()) - timedelta(days=1)).isoformat()
+    return [
+        f for f in fixtures
+        if f.get("status") != "PLAYED"
+        and (f.get("home_team"), f.get("away_team")) not in played
+        and (not f.get("match_date") or f["match_date"] >= cutoff)
+    ]
+
+def predict_fixtures(matches, fixtures, statistics, n_games=5, use_adjusted_mode=False, use_general_stats=False, aggregator="auto"):
+    """
+    Predictions for every upcoming fixture and statistic in one batch: each league's model
+    (histories, league averages, opponent multipliers) is built once per statistic and then
+    shared by all of its fixtures.
+    """
+    upcoming = upcoming_fixtures(fixtures, matches)
+
+    matches_by_league = {}
+    for row in matches:
+        matches_by_league.setdefault(row.get("league"), []).append(row)
+
+    models = {}
+    results = []
+    for fixture in upcoming:
+        league = fixture.get("league")
+        predictions = {}
+        for statistic in statistics:
+            if (league, statistic) not in models:
+                models[(league, statistic)] = LeagueModel(matches_by_league.get(league, []), statistic, aggregator)
+            predictions[statistic] = models[(league, statistic)].predict(
+                fixture.get("home_team"), fixture.get("away_team"), n_games, use_adjusted_mode, use_general_stats
+            )
+
+        results.append({
+            "id": fixture.get("id"),
+            "league": league,
+            "home": fixture.get("home_team"),
+            "away": fixture.get("away_team"),
+            "match_date": fixture.get("match_date"),
+            "giornata": fixture.get("giornata"),
+            "predictions": predictions
+        })
+    return results
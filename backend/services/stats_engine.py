@@ -0,0 +1,126 @@
+import warnings
+import numpy as np
+
+# Statistics scraped by match_details.scrape_stats, by DB column suffix (home_{stat} / away_{stat}).
+# 'interceptions' is stored as 'blocked_shots'.
+SCRAPED_STATS = [
+    "corners", "fouls", "yellow_cards", "red_cards", "shots", "shots_on_target", "possession",
+    "xg", "xgot", "big_chances", "box_touches", "crosses", "goalkeeper_saves", "blocked_shots"
+]
+STATISTICS = ["goals"] + SCRAPED_STATS
+
+CONTEXTS = ("home", "away", "all")
+SERIES = ("for", "against", "total")
+
+def stat_columns(statistics=STATISTICS):
+    """DB columns needed to build MatchColumns (for the ?fields= style projection)."""
+    columns = ["home_team", "away_team", "giornata"]
+    for stat in statistics:
+        columns += [f"home_{stat}", f"away_{stat}"]
+    return columns
+
+class MatchColumns:
+    """
+    Columnar view of the matches table: teams encoded as integers and every statistic in
+    one float matrix (NaN where the value is missing), so aggregates are computed with NumPy
+    over all teams and statistics at once instead of per team/statistic in Python.
+    """
+    def __init__(self, rows, statistics=STATISTICS):
+        self.statistics = list(statistics)
+        rows = [r for r in rows if r.get("home_team") and r.get("away_team")]
+
+        names = sorted({r["home_team"] for r in rows} | {r["away_team"] for r in rows})
+        index = {name: i for i, name in enumerate(names)}
+        self.teams = names
+        self.home = np.array([index[r["home_team"]] for r in rows], dtype=np.int64)
+        self.away = np.array([index[r["away_team"]] for r in rows], dtype=np.int64)
+        self.giornata = np.array([_to_float(r.get("giornata")) for r in rows], dtype=np.float64)
+
+        # values[match, side, stat], side 0 = home team, 1 = away team
+        self.values = np.empty((len(rows), 2, len(self.statistics)), dtype=np.float64)
+        for s, stat in enumerate(self.statistics):
+            self.values[:, 0, s] = [_to_float(r.get(f"home_{stat}")) for r in rows]
+            self.values[:, 1, s] = [_to_float(r.get(f"away_{stat}")) for r in rows]
+
+    def __len__(self):
+        return len(self.home)
+
+    def team_rows(self):
+        """
+        Long format: one row per (match, team). Returns (team, is_away, giornata, series) where
+        series[row, k, stat] holds the value for/against/total from that team's point of view.
+        """
+        team = np.concatenate([self.home, self.away])
+        is_away = np.concatenate([np.zeros(len(self), dtype=bool), np.ones(len(self), dtype=bool)])
+        giornata = np.concatenate([self.giornata, self.giornata])
+
+        stat_for = np.concatenate([self.values[:, 0], self.values[:, 1]])
+        stat_ag = np.concatenate([self.values[:, 1], self.values[:, 0]])
+        series = np.stack([stat_for, stat_ag, stat_for + stat_ag], axis=1)
+        return team, is_away, giornata, series
+
+def _to_float(value):
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def padded_by_team(team, giornata, series, n_teams):
+    """
+    Packs the long-format rows into a (team, match, series, stat) tensor, newest round first,
+    NaN-padded up to the longest team history. Returns (tensor, counts).
+    """
+    order = np.lexsort((-giornata, team))  # by team, then giornata descending
+    team_sorted = team[order]
+    counts = np.bincount(team_sorted, minlength=n_teams)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(len(order)) - starts[team_sorted]
+
+    tensor = np.full((n_teams, max(counts.max(initial=0), 1)) + series.shape[1:], np.nan)
+    tensor[team_sorted, rank] = series[order]
+    return tensor, counts
+
+def compute_team_stats(rows, last_n=5, statistics=STATISTICS):
+    """
+    Per-team aggregates (mean, median, std, mean of the last N rounds) of every statistic,
+    for/against/total, at home, away and overall: one vectorised pass over the whole league.
+    Std is the population std (as getStdDev in the frontend); missing values are ignored.
+    """
+    columns = MatchColumns(rows, statistics)
+    team, is_away, giornata, series = columns.team_rows()
+    n_teams = len(columns.teams)
+
+    result = {name: {} for name in columns.teams}
+    if not n_teams:
+        return result
+
+    masks = {"home": ~is_away, "away": is_away, "all": np.ones_like(is_away)}
+    with warnings.catch_warnings():
+        # All-NaN slices (a stat never recorded for a team) legitimately aggregate to NaN
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+
+        for context, mask in masks.items():
+            tensor, counts = padded_by_team(team[mask], giornata[mask], series[mask], n_teams)
+            aggregates = {
+                "mean": np.nanmean(tensor, axis=1),
+                "median": np.nanmedian(tensor, axis=1),
+                "std": np.nanstd(tensor, axis=1),
+                "last_n": np.nanmean(tensor[:, :last_n], axis=1)
+            }
+
+            for t, name in enumerate(columns.teams):
+                stats = {}
+                for s, stat in enumerate(columns.statistics):
+                    stats[stat] = {
+                        series_name: {agg: _clean(values[t, k, s]) for agg, values in aggregates.items()}
+                        for k, series_name in enumerate(SERIES)
+                    }
+                result[name][context] = {"matches": int(counts[t]), "stats": stats}
+
+    return result
+
+def _clean(value):
+    """NaN is not valid JSON: missing aggregates are sent as null."""
+    return None if np.isnan(value) else round(float(value), 4)
@@ -0,0 +1,137 @@
+import os
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backend.services.backtest_engine import walk_forward
+
+# Default search space. The model grid is a superset of findBestStrategy's 4x2x2 grid,
+# the betting grid replaces the single (softBuffer, minPrediction, maxLineCap) point per call.
+DEFAULT_GRID = {
+    "n_games": [1, 2, 3, 4, 5, 6, 7, 8, 10, 15, "all"],
+    "force_mean": [False, True],
+    "use_general_stats": [False, True],
+    "soft_buffer": [0, 0.25, 0.5, 0.75, 1, 1.5, 2],
+    "min_prediction": [0],
+    "max_line_cap": [None]
+}
+MIN_BETS = 10  # Strategies with fewer bets are not eligible as "best" (tiny samples win 100%)
+# Betting combinations x matches evaluated at once (~8 bytes per cell per temporary array)
+SWEEP_CHUNK_CELLS = int(os.environ.get("SWEEP_CHUNK_CELLS", 2_000_000))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    """Shared process pool. 'spawn' because the API process is multi-threaded."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=int(os.environ.get("SWEEP_WORKERS", os.cpu_count() or 2)),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+def shutdown_executor():
+    """Stops the sweep worker processes (called when the API shuts down)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def sweep(rows, statistic, grid=DEFAULT_GRID, top=10, min_bets=MIN_BETS):
+    """
+    Evaluates every (model, betting) combination of the grid for one league/statistic.
+    One walk-forward pass per model setting gives the predictions, then the betting rule of
+    evaluateStrategy is broadcast over a (betting combination, match) matrix, in chunks of at
+    most SWEEP_CHUNK_CELLS cells so memory stays bounded whatever the grid and league size.
+    """
+    models = list(itertools.product(grid["n_games"], grid["force_mean"], grid["use_general_stats"]))
+    runs = [walk_forward(rows, statistic, n, fm, g) for n, fm, g in models]
+    if not runs or not len(runs[0][1]):
+        return {"statistic": statistic, "matches": 0, "evaluated": 0, "best": None, "top": []}
+
+    actual = runs[0][1][None, :]                                              # (1, M)
+    caps = [np.inf if c is None or c <= 0 else c for c in grid["max_line_cap"]]
+    # Betting combinations flattened in (soft_buffer, min_prediction, max_line_cap) order
+    combos = np.indices((len(grid["soft_buffer"]), len(grid["min_prediction"]), len(caps))).reshape(3, -1)
+    soft_buffer = np.maximum(np.array(grid["soft_buffer"], dtype=float)[combos[0]], 0)[:, None]
+    min_prediction = np.array(grid["min_prediction"], dtype=float)[combos[1]][:, None]
+    max_line_cap = np.array(caps, dtype=float)[combos[2]][:, None]
+
+    n_combos = combos.shape[1]
+    chunk = max(1, SWEEP_CHUNK_CELLS // actual.shape[-1])
+    total_bets = np.zeros((len(models), n_combos), dtype=np.int64)
+    wins = np.zeros((len(models), n_combos), dtype=np.int64)
+    for k, (predicted, _) in enumerate(runs):
+        predicted = predicted[None, :]                                        # (1, M)
+        valid = np.nan_to_num(predicted, nan=0.0)
+        for start in range(0, n_combos, chunk):
+            part = slice(start, start + chunk)
+            bets = (valid > 0) & ((min_prediction[part] <= 0) | (valid >= min_prediction[part]))
+            line = np.minimum(np.floor(predicted - soft_buffer[part] + 0.5) - 0.5, max_line_cap[part])
+            total_bets[k, part] = bets.sum(axis=-1)
+            wins[k, part] = (bets & (actual > line)).sum(axis=-1)
+
+    total_bets, wins = total_bets.ravel(), wins.ravel()
+    win_rate = np.divide(wins, total_bets, out=np.zeros(total_bets.shape), where=total_bets > 0)
+
+    # Rank by win rate, ties (within 1e-4, as findBestStrategy) broken by number of bets
+    eligible = np.flatnonzero(total_bets >= min_bets)
+    order = np.lexsort((-total_bets[eligible], -np.round(win_rate[eligible], 4)))
+    ranked = eligible[order[:top]]
+
+    results = []
+    for flat in ranked:
+        k, combo = divmod(int(flat), n_combos)
+        b, q, c = combos[:, combo]
+        n_games, force_mean, use_general_stats = models[k]
+        results.append({
+            "nGames": n_games,
+            "forceMean": force_mean,
+            "useGeneralStats": use_general_stats,
+            "softBuffer": grid["soft_buffer"][b],
+            "minPrediction": grid["min_prediction"][q],
+            "maxLineCap": grid["max_line_cap"][c],
+            "winRate": float(win_rate[flat]),
+            "totalBets": int(total_bets[flat]),
+            "wins": int(wins[flat])
+        })
+
+    return {
+        "statistic": statistic,
+        "matches": int(actual.shape[-1]),
+        "evaluated": int(total_bets.size),
+        "best": results[0] if results else None,
+        "top": results
+    }
+
+def _sweep_task(task):
+    league, statistic, rows, grid, top = task
+    return league, statistic, sweep(rows, statistic, grid, top)
+
+def run_sweeps(rows_by_league, statistics, grid=DEFAULT_GRID, top=10):
+    """
+    Sweeps every league x statistic. Independent jobs are spread across the process pool
+    (a single job runs inline). Returns {league: {statistic: result}}.
+    """
+    tasks = [
+        (league, statistic, rows, grid, top)
+        for league, rows in rows_by_league.items()
+        for statistic in statistics
+    ]
+    results = {league: {} for league in rows_by_league}
+
+    if len(tasks) <= 1:
+        outputs = map(_sweep_task, tasks)
+    else:
+        outputs = _get_executor().map(_sweep_task, tasks)
+
+    for league, statistic, result in outputs:
+        results[league][statistic] = result
+    return results
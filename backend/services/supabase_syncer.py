@@ -1,7 +1,9 @@
 import os
 import json
-import requests
 from dotenv import load_dotenv
+from backend.services.data_cache import bump_data_version
+# Writes reuse the readers' session: one Supabase connection pool for the whole process
+from backend.services.table_reader import fetch_table, _session, REQUEST_TIMEOUT
 
 def normalize_key(home, away, giornata):
     """
@@ -143,42 +145,19 @@ def build_stats_payload(local_match):
 
     return payload
 
-def fetch_all_records(base_url, table, headers, select="*", batch_size=5000, filters=""):
+def fetch_all_records(base_url, table, headers, select="*", batch_size=1000, filters=""):
     """
     Fetches ALL records from a Supabase table using pagination (offset/limit).
+    Pages are requested concurrently after an exact-count prefetch (see table_reader.fetch_table).
     Can optionaly accept a query string 'filters' (e.g. "&league=eq.Serie A")
     """
-    all_data = []
-    offset = 0
     print(f"⏳ Fetching all records from '{table}' (Batch size: {batch_size}, Filters: '{filters}')...")
-    
-    while True:
-        try:
-            # Construct URL with limit and offset
-            req_url = f"{base_url}/rest/v1/{table}?select={select}&limit={batch_size}&offset={offset}{filters}"
-            resp = requests.get(req_url, headers=headers)
-            resp.raise_for_status()
-            
-            data = resp.json()
-            if not data:
-                break
-            
-            all_data.extend(data)
-            # Optional: print progress for large datasets
-            if offset % 20000 == 0 and offset > 0:
-                print(f"   ... loaded {len(all_data)} records so far")
-
-            if len(data) < batch_size:
-                break
-            
-            offset += batch_size
-            
-        except Exception as e:
-            print(f"❌ Error fetching batch at offset {offset}: {e}")
-            # If a batch fails, we probably should stop or retry. For now, stopping to avoid endless loops.
-            break
-
-    return all_data
+    try:
+        return fetch_table(base_url, table, headers, select=select, filters=filters, page_size=batch_size)
+    except Exception as e:
+        # Do not return a partial table: callers would treat the missing rows as new matches
+        print(f"❌ Error fetching records from '{table}': {e}")
+        raise
 
 def sync_matches_to_supabase(json_path="matches_data.json", data_list=None):
     """
@@ -272,7 +251,7 @@ def sync_matches_to_supabase(json_path="matches_data.json", data_list=None):
             if payload:
                 try:
                     patch_url = f"{url}/rest/v1/matches?id=eq.{match_id}"
-                    resp = requests.patch(patch_url, json=payload, headers=headers)
+                    resp = _session.patch(patch_url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT)
                     resp.raise_for_status()
                     print(f"✅ Updated: {h} vs {a} (Giornata {g})")
                     updated_count += 1
@@ -338,7 +317,7 @@ def sync_matches_to_supabase(json_path="matches_data.json", data_list=None):
             
             try:
                 post_url = f"{url}/rest/v1/matches"
-                resp = requests.post(post_url, json=payload, headers=headers)
+                resp = _session.post(post_url, json=payload, headers=headers, timeout=REQUEST_TIMEOUT)
                 resp.raise_for_status()
                 print(f"✅ Inserted: {h} vs {a} (Giornata {g_int})")
                 updated_count += 1 # Count as updated/processed
@@ -352,69 +331,50 @@ def sync_matches_to_supabase(json_path="matches_data.json", data_list=None):
     print(f"Updated: {updated_count}")
     print(f"Skipped: {skipped_count}")
 
-def fetch_existing_urls():
+    if updated_count:
+        bump_data_version("matches")
+
+COMMENTARY_TABLE = "match_commentary"
+
+def store_match_commentary(data_list):
     """
-    Fetches all match URLs currently in Supabase.
-    Returns a set of URLs.
+    Upserts the raw commentary of scraped matches (by URL) into COMMENTARY_TABLE, so analyses
+    can be (re)run later by analysis_backfill without opening a browser.
     """
+    rows = [
+        {
+            "url": m["url"],
+            "league": m.get("league"),
+            "comments": m["commenti"],
+            "stats": m.get("stats") or {},
+            "teams": {"home": m.get("squadre", {}).get("home"), "away": m.get("squadre", {}).get("away")}
+        }
+        for m in data_list
+        if m.get("url") and m.get("commenti")
+    ]
+    if not rows:
+        return
+
     load_dotenv()
-    
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_KEY")
-
     if not url or not key:
         print("❌ Error: Missing SUPABASE_URL or SUPABASE_KEY in .env")
-        return set()
+        return
 
     headers = {
         "apikey": key,
         "Authorization": f"Bearer {key}",
         "Content-Type": "application/json",
-        "Prefer": "return=minimal"
+        "Prefer": "resolution=merge-duplicates,return=minimal"
     }
-
-def fetch_all_records(base_url, table, headers, select="*", batch_size=5000, filters=""):
-    """
-    Fetches ALL records from a Supabase table using pagination (offset/limit).
-    Can optionaly accept a query string 'filters' (e.g. "&league=eq.Serie A")
-    """
-    all_data = []
-    offset = 0
-    print(f"⏳ Fetching all records from '{table}' (Batch size: {batch_size}, Filters: '{filters}')...")
-    
-    while True:
-        try:
-            # Construct URL with limit and offset
-            req_url = f"{base_url}/rest/v1/{table}?select={select}&limit={batch_size}&offset={offset}{filters}"
-            resp = requests.get(req_url, headers=headers)
-            resp.raise_for_status()
-            
-            data = resp.json()
-            if not data:
-                break
-            
-            all_data.extend(data)
-            # Optional: print progress for large datasets
-            if offset % 20000 == 0 and offset > 0:
-                print(f"   ... loaded {len(all_data)} records so far")
-
-            if len(data) < batch_size:
-                break
-            
-            offset += batch_size
-            
-        except Exception as e:
-            print(f"❌ Error fetching batch at offset {offset}: {e}")
-            # If a batch fails, we probably should stop or retry. For now, stopping to avoid endless loops.
-            break
-
-    return all_data
-
-# ... (sync_matches_to_supabase removed from snippet for brevity of tool call as it wasn't modified in plan, 
-#      but we need to be careful with line numbers. The replace block targets lines 339-355 which is fetch_existing_urls)
-# Wait, I need to update fetch_all_records signature as well which is lines 145+.
-# This tool call only supports contiguous edits. I'll split this into two calls or use multi_replace.
-# Using multi_replace is safer for non-contiguous edits in the same file.
+    try:
+        resp = _session.post(f"{url}/rest/v1/{COMMENTARY_TABLE}?on_conflict=url", json=rows, headers=headers, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+        print(f"💬 Stored commentary of {len(rows)} matches")
+    except Exception as e:
+        # Never block the sync of the stats: the commentary only feeds later analyses
+        print(f"⚠️ Could not store commentary in '{COMMENTARY_TABLE}': {e}")
 
 def fetch_existing_urls(league_slug=None):
     """
@@ -0,0 +1,149 @@
+import re
+import requests
+from datetime import datetime
+from collections import deque
+from itertools import islice
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+PAGE_SIZE = 1000    # Supabase caps every PostgREST response at 1000 rows (max-rows)
+MAX_WORKERS = 8     # Concurrent page requests per table read
+REQUEST_TIMEOUT = 30 # Seconds per PostgREST request: a stalled page fails the read instead of hanging it
+
+_session = requests.Session()
+_COLUMN_RE = re.compile(r"^[A-Za-z0-9_ ]+$")
+
+def count_rows(base_url, table, headers, filters=""):
+    """
+    Asks PostgREST for the exact row count (Prefer: count=exact) without transferring any row.
+    Returns None if the server does not report it.
+    """
+    resp = _session.head(
+        f"{base_url}/rest/v1/{table}?select=*{filters}",
+        headers={**headers, "Prefer": "count=exact", "Range-Unit": "items", "Range": "0-0"},
+        timeout=REQUEST_TIMEOUT
+    )
+    resp.raise_for_status()
+
+    # Content-Range: "0-0/1234" (or "*/0" for an empty table)
+    total = resp.headers.get("Content-Range", "").split("/")[-1]
+    return int(total) if total.isdigit() else None
+
+def fetch_page(base_url, table, headers, offset, limit, select="*", filters="", order="id.asc"):
+    """
+    Fetches rows [offset, offset + limit). If the server caps the response below 'limit'
+    the remaining rows are requested right away, so a page is always complete. A response
+    shorter than both the request and the server cap (PAGE_SIZE) is the end of the table.
+    """
+    rows = []
+    while len(rows) < limit:
+        requested = limit - len(rows)
+        req_url = (
+            f"{base_url}/rest/v1/{table}?select={select}&order={order}"
+            f"&limit={requested}&offset={offset + len(rows)}{filters}"
+        )
+        resp = _session.get(req_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        resp.raise_for_status()
+
+        data = resp.json()
+        rows.extend(data)
+        if len(data) < min(requested, PAGE_SIZE):
+            break
+    return rows
+
+def _stable_order(order):
+    """Offset pages fetched independently need a total order, 'id' breaks the ties."""
+    if not order:
+        return "id.asc"
+    if order.split(".")[0] == "id":
+        return order
+    return f"{order},id.asc"
+
+def iter_table_pages(base_url, table, headers, select="*", filters="", order=None, page_size=PAGE_SIZE, max_workers=MAX_WORKERS):
+    """
+    Yields the pages of a (filtered) table in order, each one as soon as it is available.
+    The first page is requested together with the row count, then at most 'max_workers' pages
+    are in flight: memory stays bounded by a few pages whatever the size of the table.
+    """
+    order = _stable_order(order)
+    fetch = lambda offset: fetch_page(base_url, table, headers, offset, page_size, select, filters, order)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        first = executor.submit(fetch, 0)
+        total = count_rows(base_url, table, headers, filters)
+        rows = first.result()
+        if rows:
+            yield rows
+
+        if total is None:
+            # No count available: fall back to walking the pages one after another
+            offset = len(rows)
+            while len(rows) == page_size:
+                rows = fetch(offset)
+                offset += len(rows)
+                if rows:
+                    yield rows
+            return
+
+        offsets = iter(range(page_size, total, page_size))
+        pending = deque(executor.submit(fetch, offset) for offset in islice(offsets, max_workers))
+        while pending:
+            rows = pending.popleft().result()
+            next_offset = next(offsets, None)
+            if next_offset is not None:
+                pending.append(executor.submit(fetch, next_offset))
+            if rows:
+                yield rows
+    finally:
+        # The consumer may stop early (e.g. client disconnected from a stream)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def fetch_table(base_url, table, headers, select="*", filters="", order=None, page_size=PAGE_SIZE, max_workers=MAX_WORKERS):
+    """
+    Reads a whole (filtered) table through PostgREST.
+    Pages are requested concurrently after the exact-count prefetch and put back in order:
+    the read takes about as long as the slowest page instead of the sum of all pages.
+    """
+    all_rows = []
+    for rows in iter_table_pages(base_url, table, headers, select, filters, order, page_size, max_workers):
+        all_rows.extend(rows)
+    return all_rows
+
+def build_select(fields, ensure=()):
+    """
+    Turns a comma separated column list ("home_team,away_team,tl dr corner") into a PostgREST
+    'select' clause. Column names with spaces are quoted. Raises ValueError on invalid names.
+    """
+    if not fields:
+        return "*"
+
+    columns = [c.strip() for c in fields.split(",") if c.strip()]
+    for column in columns:
+        if not _COLUMN_RE.match(column):
+            raise ValueError(f"Invalid field name: '{column}'")
+    for column in ensure:
+        if column not in columns:
+            columns.append(column)
+
+    return ",".join(f'"{c}"' if " " in c else c for c in columns)
+
+def build_filters(league=None, since_giornata=None, since_date=None, after_id=None):
+    """
+    Builds the PostgREST filter query string (e.g. "&league=eq.Serie%20A&giornata=gte.10").
+    Raises ValueError if since_date is not an ISO date.
+    """
+    filters = ""
+    if league:
+        filters += f"&league=eq.{quote(league)}"
+    if since_giornata is not None:
+        filters += f"&giornata=gte.{int(since_giornata)}"
+    if since_date:
+        try:
+            datetime.fromisoformat(since_date)
+        except ValueError:
+            raise ValueError(f"Invalid since_date: '{since_date}' (expected YYYY-MM-DD)")
+        filters += f"&match_date=gte.{quote(since_date)}"
+    if after_id is not None:
+        filters += f"&id=gt.{int(after_id)}"
+    return filters
@@ -2,6 +2,14 @@ import { useState, useEffect } from 'react';
 import { supabase } from '../lib/supabaseClient';
 import { API_BASE_URL } from '../config';
 
+// Columns read by the mapping below: the Gemini text columns (summary_match, detail_*) dominate the payload.
+// 'matches' has no match_date column (the syncer never writes it), so the mapped date stays undefined.
+const MATCH_STATS = ['corners', 'fouls', 'yellow_cards', 'red_cards', 'shots', 'shots_on_target', 'goals', 'possession'];
+const MATCH_FIELDS = [
+    'home_team', 'away_team', 'giornata', 'league', 'tl dr corner', 'detailed comment corner',
+    ...MATCH_STATS.flatMap(stat => [`home_${stat}`, `away_${stat}`])
+].join(',');
+
 export const useMatchData = () => {
     const [matchData, setMatchData] = useState([]);
     const [fixturesData, setFixturesData] = useState([]);
@@ -16,7 +24,7 @@ export const useMatchData = () => {
             console.log(`Fetching data from Backend (${API_BASE_URL})...`);
 
             // Fetch Matches
-            const matchesResponse = await fetch(`${API_BASE_URL}/matches`);
+            const matchesResponse = await fetch(`${API_BASE_URL}/matches?fields=${encodeURIComponent(MATCH_FIELDS)}`);
             if (!matchesResponse.ok) {
                 throw new Error(`Error fetching matches: ${matchesResponse.statusText}`);
             }
@@ -50,7 +58,7 @@ export const useMatchData = () => {
             setFixturesData(flatFixtures);
 
             // Fetch Teams (Logos)
-            const teamsResponse = await fetch(`${API_BASE_URL}/teams`);
+            const teamsResponse = await fetch(`${API_BASE_URL}/teams?fields=name,logo_url`);
             let teamLogosMap = {};
             if (teamsResponse.ok) {
                 const teams = await teamsResponse.json();